@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Orchestration benchmark for run_simulation.py / run_hardware.py
+Runs both flows over the repo's lab folders against a fake Vivado (or a real
+one with --vivado) and records per-stage timings, so changes that make the
+Python side slower show up as regressions against the previous run.
+"""
+
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent.resolve()
+REPO_ROOT = BENCH_DIR.parent
+RESULTS_FILE = BENCH_DIR / "results" / "history.jsonl"
+# A fixed location, so the toolchain cache key is the same from run to run
+FAKE_BIN_DIR = BENCH_DIR / "results" / "fake_bin"
+# Kept apart from the scripts' own toolchain cache, which --cold clears
+TOOLCHAIN_CACHE_DIR = BENCH_DIR / "results" / "toolchain_cache"
+FOLDER_RE = re.compile(r'^(HW3T\d+(_\d+)?|Lab[345]T\d+|Quiz1)$')
+STAGES = ("toolchain", "discover", "preflight", "constraints", "clean", "tcl", "vivado", "reports", "log", "overhead", "total")
+
+sys.path.insert(0, str(REPO_ROOT))
+import run_simulation   # noqa: E402
+import run_hardware     # noqa: E402
+from run_simulation import banner, divider   # noqa: E402
+
+
+# ─────────────────────────────────────────────────────────────
+# Setup
+# ─────────────────────────────────────────────────────────────
+def find_bench_folders(names=None):
+    """The repo's own lab folders (HW3T*, Lab3T1-Lab5T3, Quiz1)"""
+    folders = sorted(p for p in REPO_ROOT.iterdir() if p.is_dir() and FOLDER_RE.match(p.name))
+    if names:
+        folders = [p for p in folders if p.name in names]
+    return folders
+
+
+def make_fake_toolchain(bin_dir):
+    """Write vivado/xvlog/xelab/xsim launchers for fake_vivado.py.
+    Returns the path of the fake vivado."""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    fake = BENCH_DIR / "fake_vivado.py"
+    for tool in ("vivado", "xvlog", "xelab", "xsim"):
+        if sys.platform == "win32":
+            launcher = bin_dir / f"{tool}.bat"
+            launcher.write_text(f'@"{sys.executable}" "{fake}" {tool} %*\n')
+        else:
+            launcher = bin_dir / tool
+            launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{fake}" {tool} "$@"\n')
+            launcher.chmod(0o755)
+    return str(bin_dir / ("vivado.bat" if sys.platform == "win32" else "vivado"))
+
+
+def stage_workspace(folder, workspace, cold):
+    """Copy a lab folder's sources (and its old project, so cleanup has
+    something real to delete) into the scratch workspace"""
+    target = workspace / folder.name
+    if target.exists():
+        cache = target / run_simulation.CACHE_DIR_NAME
+        saved = None
+        if not cold and cache.exists():
+            saved = workspace / "_cache"
+            shutil.rmtree(saved, ignore_errors=True)
+            shutil.move(str(cache), str(saved))
+        shutil.rmtree(target)
+        target.mkdir()
+        if saved:
+            shutil.move(str(saved), str(cache))
+    else:
+        target.mkdir()
+    for vfile in folder.glob("*.v"):
+        shutil.copy2(vfile, target)
+    if (folder / "vivado_project").exists():
+        shutil.copytree(folder / "vivado_project", target / "vivado_project")
+    return target
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(REPO_ROOT),
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              universal_newlines=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+# ─────────────────────────────────────────────────────────────
+# Measurement
+# ─────────────────────────────────────────────────────────────
+def run_once(flow, source_dir):
+    """Run one flow end to end; return ({stage: seconds}, success).
+    Vivado is found through VIVADO_PATH, so the toolchain stage measures
+    the real discovery path and its cache."""
+    start = time.perf_counter()
+    if flow == "sim":
+        result = run_simulation.simulate(source_dir, toolchain_cache_dir=TOOLCHAIN_CACHE_DIR)
+        extract = run_simulation.extract_errors
+    else:
+        result = run_hardware.build_hardware(source_dir, toolchain_cache_dir=TOOLCHAIN_CACHE_DIR)
+        extract = run_hardware.extract_errors
+    total = time.perf_counter() - start
+
+    timings = dict(result.timings)
+    log_start = time.perf_counter()
+    extract(result.output)
+    timings["log"] = time.perf_counter() - log_start
+    timings["total"] = total
+    timings["overhead"] = total - timings.get("vivado", 0.0)
+    return timings, result.success
+
+
+def eligible(flow, folder):
+    if flow == "sim":
+        design, testbenches, _ = run_simulation.find_verilog_files(folder)
+        return bool(design and testbenches)
+    design, top, _ = run_hardware.find_verilog_files(folder)
+    return bool(design and top)
+
+
+def benchmark(flows, folders, repeat, cold, workspace):
+    """Returns {flow: {"stages": {stage: [seconds...]}, "folders": {name: [overhead...]},
+    "failed": {name: runs}}}. Per-folder numbers are orchestration overhead:
+    end-to-end time minus the time spent inside Vivado. Failed runs stop
+    early, so they are counted but kept out of the timings."""
+    toolchain_cache = TOOLCHAIN_CACHE_DIR / "toolchain.json"
+    report = {}
+    for flow in flows:
+        stages = {s: [] for s in STAGES}
+        per_folder = {}
+        failed = {}
+        for folder in folders:
+            if not eligible(flow, folder):
+                continue
+            per_folder[folder.name] = []
+            for _ in range(repeat):
+                source_dir = stage_workspace(folder, workspace, cold)
+                if cold and toolchain_cache.exists():
+                    toolchain_cache.unlink()
+                timings, ok = run_once(flow, source_dir)
+                if not ok:
+                    failed[folder.name] = failed.get(folder.name, 0) + 1
+                    continue
+                for stage in STAGES:
+                    stages[stage].append(timings.get(stage, 0.0))
+                per_folder[folder.name].append(timings["overhead"])
+        report[flow] = {"stages": stages, "folders": per_folder, "failed": failed}
+    return report
+
+
+def summarise(report):
+    """Reduce raw samples to medians in milliseconds"""
+    return {
+        flow: {
+            "stages": {s: round(statistics.median(v) * 1000, 3) for s, v in data["stages"].items() if v},
+            "folders": {f: round(statistics.median(v) * 1000, 3) for f, v in data["folders"].items() if v},
+            "failed": data["failed"],
+        }
+        for flow, data in report.items()
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# History
+# ─────────────────────────────────────────────────────────────
+def load_previous(record):
+    """Most recent stored run with the same settings on the same host"""
+    if not RESULTS_FILE.exists():
+        return None
+    keys = ("mode", "speed", "cold", "repeat", "host")
+    previous = None
+    with open(RESULTS_FILE, 'r') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if all(entry.get(k) == record.get(k) for k in keys):
+                previous = entry
+    return previous
+
+
+def save_record(record):
+    RESULTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(RESULTS_FILE, 'a') as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def print_report(record, previous, threshold, min_ms):
+    """Print stage medians next to the previous run; return regressed rows"""
+    regressions = []
+    for flow, data in record["results"].items():
+        folders = set(data["folders"]) | set(data["failed"])
+        banner(f"{'Simulation' if flow == 'sim' else 'Hardware'} flow  "
+               f"({len(folders)} folders x {record['repeat']})")
+        before = (previous or {}).get("results", {}).get(flow, {})
+        rows = [("stage", s, ms, before.get("stages", {}).get(s)) for s, ms in data["stages"].items()]
+        rows += [("folder", f, ms, before.get("folders", {}).get(f)) for f, ms in data["folders"].items()]
+
+        print(f"  {'':<14}{'median ms':>12}{'previous':>12}{'change':>10}")
+        divider()
+        last_kind = "stage"
+        for kind, name, ms, old in rows:
+            if kind != last_kind:
+                divider()
+                print("  Overhead per folder")
+                last_kind = kind
+            change = ""
+            if old:
+                delta = (ms - old) / old
+                change = f"{delta:+.0%}"
+                # vivado/total are dominated by the tool itself, not our code
+                if delta > threshold and ms - old > min_ms and name not in ("vivado", "total"):
+                    change += "  !"
+                    regressions.append((flow, name, old, ms))
+            old_text = f"{old:.2f}" if old is not None else "-"
+            print(f"  {name:<14}{ms:>12.2f}{old_text:>12}{change:>10}")
+        if data["failed"]:
+            divider()
+            print("  Failed runs (not in the timings above)")
+            for name, runs in sorted(data["failed"].items()):
+                # a folder that used to pass is a regression, not a speedup
+                new = name not in before.get("failed", {})
+                if new and name in before.get("folders", {}):
+                    regressions.append((flow, name, before["folders"][name], None))
+                    print(f"  {name:<14}{runs:>6} of {record['repeat']}  !")
+                else:
+                    print(f"  {name:<14}{runs:>6} of {record['repeat']}")
+    divider()
+    return regressions
+
+
+# ─────────────────────────────────────────────────────────────
+# Entry point
+# ─────────────────────────────────────────────────────────────
+def main():
+    args = sys.argv[1:]
+    if "-h" in args or "--help" in args:
+        print("\n  Usage:  python benchmarks/bench.py [options]")
+        print()
+        print("  Options:")
+        print("    --flows <sim,hw>     Flows to measure (default: sim,hw)")
+        print("    --folders <a,b>      Only these lab folders (default: all)")
+        print("    --repeat <n>         Runs per folder (default: 3)")
+        print("    --speed <x>          Fake Vivado delay multiplier (default: 0)")
+        print("    --vivado <path>      Benchmark a real Vivado instead of the fake")
+        print("    --cold               Clear .vivado_cache (and the benchmark's toolchain cache) before every run")
+        print("    --threshold <frac>   Regression threshold (default: 0.2 = +20%)")
+        print("    --no-save            Don't append this run to the history")
+        print("    --fail-on-regression Exit 1 when a stage regressed")
+        print()
+        sys.exit(0)
+
+    flows, names, repeat, speed = ["sim", "hw"], None, 3, 0.0
+    vivado, cold, threshold, save, strict = None, False, 0.2, True, False
+    i = 0
+    while i < len(args):
+        opt = args[i]
+        value = args[i + 1] if i + 1 < len(args) else None
+        if opt == "--flows" and value:
+            flows = value.split(",")
+            i += 2
+        elif opt == "--folders" and value:
+            names = value.split(",")
+            i += 2
+        elif opt == "--repeat" and value:
+            repeat = int(value)
+            i += 2
+        elif opt == "--speed" and value:
+            speed = float(value)
+            i += 2
+        elif opt == "--vivado" and value:
+            vivado = value
+            i += 2
+        elif opt == "--threshold" and value:
+            threshold = float(value)
+            i += 2
+        elif opt == "--cold":
+            cold = True
+            i += 1
+        elif opt == "--no-save":
+            save = False
+            i += 1
+        elif opt == "--fail-on-regression":
+            strict = True
+            i += 1
+        else:
+            i += 1
+
+    folders = find_bench_folders(names)
+    if vivado:
+        os.environ["VIVADO_PATH"] = vivado
+    else:
+        os.environ["FAKE_VIVADO_SPEED"] = str(speed)
+        os.environ["VIVADO_PATH"] = make_fake_toolchain(FAKE_BIN_DIR)
+        os.environ.pop("VIVADO_VERSION", None)   # the fake has no version
+    with tempfile.TemporaryDirectory(prefix="vivado-bench-") as scratch:
+        report = benchmark(flows, folders, repeat, cold, Path(scratch))
+
+    record = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "mode": "real" if vivado else "fake",
+        "speed": None if vivado else speed,
+        "cold": cold,
+        "repeat": repeat,
+        "results": summarise(report),
+    }
+    previous = load_previous(record)
+    regressions = print_report(record, previous, threshold, min_ms=1.0)
+    if previous:
+        print(f"  Compared with {previous['timestamp']} ({previous.get('revision') or 'unknown rev'})")
+    if regressions:
+        print(f"  {len(regressions)} regression(s) over +{threshold:.0%} marked with '!'")
+    if save:
+        save_record(record)
+        print(f"  Saved to {RESULTS_FILE.relative_to(REPO_ROOT)}")
+    print()
+    sys.exit(1 if strict and regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
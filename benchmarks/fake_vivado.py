@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Scriptable stand-in for Vivado and its xsim tools
+Replays a transcript and creates the files a real run would leave behind,
+so the Python orchestration can be measured without Vivado. The shipped
+transcripts are synthetic ("source": "synthetic"): written by hand in the
+shape of a Vivado 2018.3 log, with rounded timings. --record writes the
+same format from a real install ("source": "recorded").
+
+    fake_vivado.py <tool> [tool args...]
+    fake_vivado.py --record <transcript.json> --real <vivado> [vivado args...]
+
+Environment
+    FAKE_VIVADO_SPEED        multiplier on transcript delays (default 0 = instant,
+                             1 = transcript timing)
+    FAKE_VIVADO_TRANSCRIPTS  directory holding <flow>.json transcripts
+    FAKE_VIVADO_FAIL         if set, end the run with an ERROR line and exit 1
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+TRANSCRIPT_DIR = Path(os.environ.get("FAKE_VIVADO_TRANSCRIPTS",
+                                     Path(__file__).parent.resolve() / "transcripts"))
+
+
+TIMING_REPORT = """\
+Copyright 1986-2018 Xilinx, Inc. All Rights Reserved.
+| Tool Version : Vivado v.2018.3 (lin64) Build 2405991 Thu Dec  6 23:36:41 MST 2018
+| Command      : report_timing_summary -max_paths 10 -file {top}_timing_summary_routed.rpt
+| Design       : {top}
+| Device       : 7a35t-cpg236
+------------------------------------------------------------------------------------
+
+Timing Summary Report
+
+------------------------------------------------------------------------------------------------
+| Design Timing Summary
+| ---------------------
+------------------------------------------------------------------------------------------------
+
+    WNS(ns)      TNS(ns)  TNS Failing Endpoints  TNS Total Endpoints      WHS(ns)      THS(ns)  THS Failing Endpoints  THS Total Endpoints     WPWS(ns)     TPWS(ns)  TPWS Failing Endpoints  TPWS Total Endpoints
+    -------      -------  ---------------------  -------------------      -------      -------  ---------------------  -------------------     --------     --------  ----------------------  --------------------
+      {wns:.3f}        0.000                      0                   {ends}        0.152        0.000                      0                   {ends}        4.500        0.000                       0                    {ends}
+
+
+All user specified timing constraints are met.
+
+
+------------------------------------------------------------------------------------------------
+| Clock Summary
+| -------------
+------------------------------------------------------------------------------------------------
+
+Clock        Waveform(ns)       Period(ns)      Frequency(MHz)
+-----        ------------       ----------      --------------
+sys_clk_pin  {{0.000 5.000}}      10.000          100.000
+
+"""
+
+UTILIZATION_REPORT = """\
+Copyright 1986-2018 Xilinx, Inc. All Rights Reserved.
+| Command      : report_utilization -file {top}_utilization_placed.rpt -pb {top}_utilization_placed.pb
+| Design       : {top}
+| Device       : 7a35tcpg236-1
+| Design State : Fully Placed
+
+1. Slice Logic
+--------------
+
++-------------------------+------+-------+-----------+-------+
+|        Site Type        | Used | Fixed | Available | Util% |
++-------------------------+------+-------+-----------+-------+
+| Slice LUTs              | {luts:>4} |     0 |     20800 |  {lut_pct:.2f} |
+|   LUT as Logic          | {luts:>4} |     0 |     20800 |  {lut_pct:.2f} |
+|   LUT as Memory         |    0 |     0 |      9600 |  0.00 |
+| Slice Registers         | {ffs:>4} |     0 |     41600 |  {ff_pct:.2f} |
+|   Register as Flip Flop | {ffs:>4} |     0 |     41600 |  {ff_pct:.2f} |
+| F7 Muxes                |    0 |     0 |     16300 |  0.00 |
++-------------------------+------+-------+-----------+-------+
+
+3. Memory
+---------
+
++----------------+------+-------+-----------+-------+
+|    Site Type   | Used | Fixed | Available | Util% |
++----------------+------+-------+-----------+-------+
+| Block RAM Tile |    0 |     0 |        50 |  0.00 |
+|   RAMB36/FIFO* |    0 |     0 |        50 |  0.00 |
++----------------+------+-------+-----------+-------+
+
+4. DSP
+------
+
++-----------+------+-------+-----------+-------+
+| Site Type | Used | Fixed | Available | Util% |
++-----------+------+-------+-----------+-------+
+| DSPs      |    0 |     0 |        90 |  0.00 |
++-----------+------+-------+-----------+-------+
+"""
+
+POWER_REPORT = """\
+Copyright 1986-2018 Xilinx, Inc. All Rights Reserved.
+| Command      : report_power -file {top}_power_routed.rpt
+| Design       : {top}
+| Device       : xc7a35tcpg236-1
+| Design State : routed
+
+1. Summary
+----------
+
++--------------------------+--------------+
+| Total On-Chip Power (W)  | {total:.3f}        |
+| Design Power Budget (W)  | Unspecified* |
+| Power Budget Margin (W)  | NA           |
+| Dynamic (W)              | {dynamic:.3f}        |
+| Device Static (W)        | 0.070        |
+| Effective TJA (C/W)      | 5.0          |
+| Max Ambient (C)          | 84.6         |
+| Junction Temperature (C) | 25.4         |
+| Confidence Level         | Low          |
++--------------------------+--------------+
+"""
+
+
+def write_reports(impl_dir, top, tcl):
+    """Write routed timing, placed utilization and routed power reports.
+    Numbers scale with the number of source files so designs differ."""
+    size = max(1, tcl.count("add_files -norecurse") - 1)
+    luts, ffs = 6 + 9 * size, 4 + 11 * size
+    (impl_dir / f"{top}_timing_summary_routed.rpt").write_text(
+        TIMING_REPORT.format(top=top, wns=6.1 - 0.35 * size, ends=ffs))
+    (impl_dir / f"{top}_utilization_placed.rpt").write_text(
+        UTILIZATION_REPORT.format(top=top, luts=luts, ffs=ffs,
+                                  lut_pct=100.0 * luts / 20800, ff_pct=100.0 * ffs / 41600))
+    (impl_dir / f"{top}_power_routed.rpt").write_text(
+        POWER_REPORT.format(top=top, total=0.070 + 0.002 * size, dynamic=0.002 * size))
+
+
+def detect_flow(tool, args):
+    """Work out which transcript a command line corresponds to"""
+    if tool != "vivado":
+        return tool
+    if "-source" not in args or "batch" not in args:
+        return None
+    tcl = Path(args[args.index("-source") + 1]).read_text()
+    if "launch_simulation" in tcl:
+        return "simulation"
+    if "launch_runs" in tcl:
+        return "hardware"
+    return None
+
+
+def make_artifacts(flow, args):
+    """Create the project files a real Vivado run would leave behind"""
+    if flow not in ("simulation", "hardware"):
+        return
+    tcl = Path(args[args.index("-source") + 1]).read_text()
+    m = re.search(r'create_project (\S+) \{([^}]*)\}', tcl)
+    if not m:
+        return
+    name, project_dir = m.group(1), Path(m.group(2))
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / f"{name}.xpr").write_text("<?xml version=\"1.0\"?>\n<Project/>\n")
+
+    if flow == "simulation":
+        tb = re.search(r'set_property top (\S+) \[get_filesets sim_1\]', tcl)
+        sim_dir = project_dir / f"{name}.sim" / "sim_1" / "behav" / "xsim"
+        sim_dir.mkdir(parents=True, exist_ok=True)
+        (sim_dir / f"{tb.group(1) if tb else name}_behav.wdb").write_bytes(b"\0" * 1024)
+    else:
+        top = re.search(r'set_property top (\S+) \[current_fileset\]', tcl)
+        impl_dir = project_dir / f"{name}.runs" / "impl_1"
+        impl_dir.mkdir(parents=True, exist_ok=True)
+        top_name = top.group(1) if top else name
+        (impl_dir / f"{top_name}.bit").write_bytes(b"\0" * 2192012)
+        write_reports(impl_dir, top_name, tcl)
+
+
+def replay(flow, speed):
+    """Print a transcript's lines with its spacing scaled by speed"""
+    transcript = TRANSCRIPT_DIR / f"{flow}.json"
+    if not flow or not transcript.exists():
+        return
+    with open(transcript, 'r') as f:
+        lines = json.load(f)["lines"]
+    start = time.time()
+    for at, text in lines:
+        delay = at * speed - (time.time() - start)
+        if delay > 0:
+            time.sleep(delay)
+        print(text, flush=True)
+
+
+def record(out_file, real_cmd):
+    """Run the real tool, timestamping each output line into a transcript
+    named after the flow it replays"""
+    tool = Path(real_cmd[0]).stem
+    flow = detect_flow(tool, real_cmd[1:]) or Path(out_file).stem
+    start = time.time()
+    lines = []
+    proc = subprocess.Popen(real_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            universal_newlines=True)
+    for text in proc.stdout:
+        sys.stdout.write(text)
+        lines.append([round(time.time() - start, 3), text.rstrip("\n")])
+    proc.wait()
+    with open(out_file, 'w') as f:
+        json.dump({"tool": tool, "flow": flow, "source": "recorded", "lines": lines}, f, indent=1)
+    return proc.returncode
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+    if sys.argv[1] == "--record":
+        out_file, real = sys.argv[2], sys.argv[4]
+        sys.exit(record(out_file, [real] + sys.argv[5:]))
+
+    tool, args = sys.argv[1], sys.argv[2:]
+    speed = float(os.environ.get("FAKE_VIVADO_SPEED", "0"))
+    flow = detect_flow(tool, args)
+    replay(flow, speed)
+    if os.environ.get("FAKE_VIVADO_FAIL"):
+        print("ERROR: [Common 17-39] 'launch_runs' failed due to earlier errors.")
+        sys.exit(1)
+    make_artifacts(flow, args)
+    if tool == "xvlog":
+        # compiled library location the sweep flow points xelab at
+        Path("xsim.dir", "work").mkdir(parents=True, exist_ok=True)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
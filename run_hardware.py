@@ -11,6 +11,15 @@ from pathlib import Path
 import shutil
 import threading
 import time
+import re
+import json
+import hashlib
+
+from vivado_common import (
+    FlowResult, QuietReporter, timed_stage, CACHE_DIR_NAME, load_json_cache,
+    save_json_cache, preflight_check, prepare_constraints, resolve_toolchain,
+    VIVADO_NOT_FOUND_HINT, extract_errors
+)
 
 # Fix Windows PowerShell encoding for unicode output
 if sys.platform == "win32":
@@ -172,6 +181,7 @@ def run_vivado_batch(tcl_file, vivado_path, cwd):
     process.wait()
     return process.returncode == 0, output
 
+
 def open_vivado_gui(project_dir, vivado_path):
     """Launch Vivado GUI with the project already open, then open Hardware Manager.
     This is fire-and-forget -- we don't wait for the user to close it."""
@@ -198,74 +208,277 @@ def open_vivado_gui(project_dir, vivado_path):
 
 
 # ─────────────────────────────────────────────────────────────
-# Main flow  (logic unchanged, output cleaned up)
+# Report extraction
 # ─────────────────────────────────────────────────────────────
-def create_and_program(source_dir, program_device=True, board="basys3", vivado_path="vivado"):
-    """Create project and run hardware flow"""
+REPORTS_CACHE_VERSION = 1
+REPORTS_HISTORY = 20   # builds kept per source dir for comparison
+
+_UTIL_ROWS = {"Slice LUTs": "lut", "Slice Registers": "ff", "Block RAM Tile": "bram", "DSPs": "dsp"}
+_POWER_ROWS = {"Total On-Chip Power (W)": "total_w", "Dynamic (W)": "dynamic_w",
+               "Device Static (W)": "static_w", "Junction Temperature (C)": "junction_c"}
+
+
+_LEADING_NUMBER_RE = re.compile(r'\s*(-?\d+(?:\.\d+)?)')
+
+
+def _to_float(text):
+    """Leading number of a report cell; Vivado appends notes such as
+    '21.092 (Junction temp exceeded!)'"""
+    m = _LEADING_NUMBER_RE.match(text or "")
+    return float(m.group(1)) if m else None   # 'inf', 'NA', 'Unspecified*', ...
+
+
+def parse_timing_summary(rpt_file):
+    """WNS/TNS/WHS/THS (ns), primary clock period and achieved fmax from a
+    report_timing_summary file"""
+    with open(rpt_file, 'r', errors='replace') as f:
+        lines = f.read().splitlines()
+    timing = {"wns": None, "tns": None, "whs": None, "ths": None,
+              "clock": None, "period_ns": None, "fmax_mhz": None}
+
+    for i, line in enumerate(lines):
+        if "WNS(ns)" in line and "TNS(ns)" in line and "WHS(ns)" in line:
+            values = next((l.split() for l in lines[i + 2:] if l.strip()), [])
+            if len(values) >= 6:
+                timing.update(wns=_to_float(values[0]), tns=_to_float(values[1]),
+                              whs=_to_float(values[4]), ths=_to_float(values[5]))
+            break
+
+    for i, line in enumerate(lines):
+        if line.strip().startswith("Clock") and "Period(ns)" in line:
+            for row in lines[i + 2:]:
+                m = re.match(r'^\s*(\S+)\s+\{[^}]*\}\s+([\d.]+)\s+([\d.]+)', row)
+                if not m:
+                    break
+                timing.update(clock=m.group(1), period_ns=float(m.group(2)))
+                break
+            break
+
+    if timing["period_ns"] and timing["wns"] is not None and timing["period_ns"] > timing["wns"]:
+        timing["fmax_mhz"] = round(1000.0 / (timing["period_ns"] - timing["wns"]), 3)
+    return timing
+
+
+def _parse_table_rows(rpt_file, wanted):
+    """First value column of '| name | value | ...' rows named in `wanted`"""
+    found = {}
+    with open(rpt_file, 'r', errors='replace') as f:
+        for line in f:
+            cells = [c.strip() for c in line.strip().strip("|").split("|")]
+            if len(cells) < 2:
+                continue
+            key = wanted.get(cells[0].rstrip("*").strip())
+            if key and key not in found:
+                found[key] = _to_float(cells[1])
+    return {key: found.get(key) for key in wanted.values()}
 
-    design_files, top_file, source_path = find_verilog_files(source_dir)
 
-    if not design_files:
-        print("\n  ERROR: No Verilog design files found!")
-        return False
+def parse_utilization(rpt_file):
+    """LUT / FF / BRAM tile / DSP counts from a report_utilization file"""
+    return _parse_table_rows(rpt_file, _UTIL_ROWS)
 
-    if not top_file:
-        print("\n  ERROR: No top module file found!")
-        print("          Hardware flow requires a file with '_top' in the name")
-        print("          Example: two_bit_comparator_top.v")
-        return False
 
-    design_top = detect_top_module(top_file)
-    if not design_top:
-        print(f"\n  ERROR: Could not detect module name in: {top_file}")
-        return False
+def parse_power(rpt_file):
+    """Total, dynamic and static power (W) from a report_power file"""
+    return _parse_table_rows(rpt_file, _POWER_ROWS)
 
-    project_name = source_path.name
-    project_dir  = source_path / "vivado_project"
 
-    # Constraint file -- script dir first, then source dir
-    script_dir = Path(__file__).parent.resolve()
-    constraint_files = list(script_dir.glob("*.xdc"))
-    if not constraint_files:
-        constraint_files = list(source_path.glob("*.xdc"))
+def collect_reports(impl_dir, top):
+    """Parse the routed timing, placed utilization and routed power reports
+    Vivado's default impl_1 strategy writes. Returns (summary, files);
+    sections whose report is missing are None."""
+    sources = {
+        "timing":      (impl_dir / f"{top}_timing_summary_routed.rpt", parse_timing_summary),
+        "utilization": (impl_dir / f"{top}_utilization_placed.rpt", parse_utilization),
+        "power":       (impl_dir / f"{top}_power_routed.rpt", parse_power),
+    }
+    summary, files = {}, {}
+    for name, (rpt_file, parser) in sources.items():
+        summary[name] = parser(rpt_file) if rpt_file.exists() else None
+        if rpt_file.exists():
+            files[f"{name}_report"] = rpt_file
+    return summary, files
+
+
+def build_hash(design_files, constraint_files, part, top):
+    """Identify a build by its sources, constraints, part and top module"""
+    digest = hashlib.sha1(f"{part}\n{top}\n".encode())
+    for path in sorted(design_files) + list(constraint_files):
+        digest.update(Path(path).name.encode())
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def record_build(cache_dir, digest, summary):
+    """Store a build's report summary under its hash and return the summary
+    of the most recent earlier build with different sources, or None"""
+    cache_file = Path(cache_dir) / "reports.json"
+    cache = load_json_cache(cache_file, REPORTS_CACHE_VERSION)
+    builds = cache.get("builds", {})
+    history = [h for h in cache.get("history", []) if h in builds]
+
+    previous = next((builds[h] for h in reversed(history) if h != digest), None)
+
+    builds[digest] = dict(summary, timestamp=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    history = [h for h in history if h != digest] + [digest]
+    history = history[-REPORTS_HISTORY:]
+    cache.update(version=REPORTS_CACHE_VERSION, history=history,
+                 builds={h: builds[h] for h in history})
+    save_json_cache(cache_file, cache)
+    return previous
+
+
+# ─────────────────────────────────────────────────────────────
+# Main flow
+# ─────────────────────────────────────────────────────────────
+class HardwareResult(FlowResult):
+    """Result of build_hardware(). Adds to FlowResult:
+    top_file           Path or None -- the '_top' file holding design_top
+    constraints        {'kept', 'total', 'missing', 'cached'} from prepare_constraints
+    build_hash         str or None -- hash of sources, constraints, part and top
+    reports            {'timing', 'utilization', 'power'} summaries (see collect_reports)
+    previous_reports   the same for the previous build with different sources, or None
+    program_device     bool
+    hw_manager_opened  bool -- Hardware Manager GUI was launched
+    """
+    def __init__(self, source_dir, board, program_device):
+        super().__init__(source_dir, board)
+        self.top_file = None
+        self.constraints = {}
+        self.build_hash = None
+        self.reports = {}
+        self.previous_reports = None
+        self.program_device = program_device
+        self.hw_manager_opened = False
+
+
+def build_hardware(source_dir, program_device=False, board="basys3", vivado_path=None,
+                   preflight=True, xvlog=False, reporter=None, vivado_version=None,
+                   toolchain_cache_dir=None):
+    """Create project and run synthesis, implementation and bitstream
+    generation, returning a HardwareResult. Nothing is printed unless a
+    reporter (e.g. TerminalReporter()) is given. Without vivado_path,
+    Vivado is located with resolve_toolchain(), which caches the lookup in
+    toolchain_cache_dir (default: next to this script)."""
+    reporter = reporter or QuietReporter()
+    result = HardwareResult(source_dir, board, program_device)
+    try:
+        _build_hardware(result, vivado_path, vivado_version, toolchain_cache_dir, preflight, xvlog,
+                        reporter)
+    finally:
+        reporter.finish(result)
+    return result
+
+
+def _build_hardware(result, vivado_path, vivado_version, toolchain_cache_dir, preflight, xvlog,
+                    reporter):
+    with timed_stage(result, "toolchain"):
+        toolchain = resolve_toolchain(vivado_path, vivado_version, toolchain_cache_dir)
+        result.toolchain = toolchain
+        result.cache_hits["toolchain"] = int(bool(toolchain and toolchain.cached))
+    if not toolchain:
+        wanted = vivado_version or os.environ.get("VIVADO_VERSION")
+        where = f" in {vivado_path}" if vivado_path else ""
+        result.add_error("setup", f"Vivado {wanted + ' ' if wanted else ''}executable not found{where}!",
+                         hint=VIVADO_NOT_FOUND_HINT)
+        return
+    vivado_path = toolchain.vivado
+
+    with timed_stage(result, "discover"):
+        design_files, top_file, source_path = find_verilog_files(result.source_dir)
+        result.design_files = design_files
+        result.top_file = top_file
+
+        if not design_files:
+            result.add_error("setup", "No Verilog design files found!")
+            return
+
+        if not top_file:
+            result.add_error("setup", "No top module file found!",
+                             hint="Hardware flow requires a file with '_top' in the name\n"
+                                  "Example: two_bit_comparator_top.v")
+            return
+
+        result.design_top = detect_top_module(top_file)
+        if not result.design_top:
+            result.add_error("setup", f"Could not detect module name in: {top_file}")
+            return
+
+        # Constraint file -- script dir first, then source dir
+        script_dir = Path(__file__).parent.resolve()
+        constraint_files = list(script_dir.glob("*.xdc"))
+        if not constraint_files:
+            constraint_files = list(source_path.glob("*.xdc"))
+        if constraint_files:
+            result.constraint_file = constraint_files[0]
 
     if not constraint_files:
-        print("\n  WARNING: No constraint file (.xdc) found!")
-        response = input("  Continue anyway? (y/n): ")
-        if response.lower() != 'y':
-            return False
-
-    # ── summary ──────────────────────────────────────────────
-    banner("Vivado Hardware Flow")
-    print(f"  Project     {project_name}")
-    print(f"  Top         {design_top}")
-    print(f"  Target      {board.upper()}")
-    divider()
-    print("  Files")
-    for df in design_files:
-        tag = "  [top]" if df == top_file else ""
-        print(f"    {df.name}{tag}")
+        if not reporter.confirm("No constraint file (.xdc) found!"):
+            result.add_error("setup", "No constraint file (.xdc) found!")
+            return
+        result.add_warning("setup", "No constraint file (.xdc) found!")
+
+    project_name = result.project_name
+    project_dir  = result.project_dir
+    design_top   = result.design_top
+    cache_dir    = source_path / CACHE_DIR_NAME
+    reporter.plan(result)
+
+    # ── pre-flight ───────────────────────────────────────────
+    if preflight:
+        xvlog_path = None
+        if xvlog:
+            xvlog_path = toolchain.tool("xvlog")
+            if not xvlog_path:
+                result.add_warning("preflight", "xvlog not found, using the Python scanner only")
+        with timed_stage(result, "preflight", reporter, "Pre-flight check") as st:
+            problems, warnings, rechecked = preflight_check(design_files, cache_dir, xvlog_path)
+            result.cache_hits["preflight"] = len(design_files) - len(rechecked)
+            st.message = f"Pre-flight check  ({len(rechecked)}/{len(design_files)} files rescanned)"
+            for vfile, line, msg in problems:
+                result.add_error("preflight", msg, file=vfile, line=line)
+            for vfile, line, msg in warnings:
+                result.add_warning("preflight", msg, file=vfile, line=line)
+            if problems:
+                st.fail()
+        if problems:
+            return
+
+    # ── constraints: keep only what applies to the top ports ─
     if constraint_files:
-        print("  Constraints")
-        print(f"    {constraint_files[0].name}")
-    divider()
+        with timed_stage(result, "constraints", reporter, "Pruning constraints") as st:
+            xdc_file, result.constraints = prepare_constraints(constraint_files[0], top_file,
+                                                               design_top, cache_dir)
+            result.cache_hits["xdc"] = int(result.constraints["cached"])
+            result.artifacts["xdc"] = xdc_file
+            st.message = (f"Pruning constraints  ({result.constraints['kept']} of "
+                          f"{result.constraints['total']} kept)")
+            for port, props in result.constraints["missing"].items():
+                result.add_error("constraints", f"{port} has no {' / '.join(props)}",
+                                 file=constraint_files[0])
+            if result.constraints["missing"]:
+                st.fail()
+        if result.constraints["missing"]:
+            return
+        constraint_files = [xdc_file]
 
     # ── board config ─────────────────────────────────────────
     board_configs = {
         "basys3": {"part": "xc7a35tcpg236-1",  "board_part": "digilentinc.com:basys3:part0:1.2"},
         "arty":   {"part": "xc7a35ticsg324-1L","board_part": "digilentinc.com:arty-a7-35:part0:1.1"},
     }
-    if board not in board_configs:
-        board = "basys3"
-    board_cfg = board_configs[board]
+    if result.board not in board_configs:
+        result.board = "basys3"
+    board_cfg = board_configs[result.board]
 
     # ── clean old project ────────────────────────────────────
     if project_dir.exists():
-        with Spinner("Cleaning old project"):
+        with timed_stage(result, "clean", reporter, "Cleaning old project"):
             shutil.rmtree(project_dir)
 
     # ── generate Tcl ─────────────────────────────────────────
-    tcl_script = f"""
+    with timed_stage(result, "tcl"):
+        tcl_script = f"""
 create_project {project_name} {{{project_dir}}} -part {board_cfg['part']} -force
 
 if {{[catch {{set_property board_part {board_cfg['board_part']} [current_project]}}]}} {{
@@ -274,15 +487,15 @@ if {{[catch {{set_property board_part {board_cfg['board_part']} [current_project
 
 set_property target_language Verilog [current_project]
 """
-    for vfile in design_files:
-        tcl_script += f'add_files -norecurse {{{vfile}}}\n'
+        for vfile in design_files:
+            tcl_script += f'add_files -norecurse {{{vfile}}}\n'
 
-    if constraint_files:
-        tcl_script += f'add_files -fileset constrs_1 -norecurse {{{constraint_files[0]}}}\n'
+        if constraint_files:
+            tcl_script += f'add_files -fileset constrs_1 -norecurse {{{constraint_files[0]}}}\n'
 
-    tcl_script += f'set_property top {design_top} [current_fileset]\n'
+        tcl_script += f'set_property top {design_top} [current_fileset]\n'
 
-    tcl_script += """
+        tcl_script += """
 update_compile_order -fileset sources_1
 
 reset_run synth_1
@@ -314,49 +527,179 @@ if {$bit_status != "write_bitstream Complete!"} {
 close_project
 """
 
-    tcl_file = source_path / "run_hardware.tcl"
-    with open(tcl_file, 'w') as f:
-        f.write(tcl_script)
+        tcl_file = source_path / "run_hardware.tcl"
+        with open(tcl_file, 'w') as f:
+            f.write(tcl_script)
+        result.artifacts["tcl"] = tcl_file
 
     # ── run Vivado batch ─────────────────────────────────────
-    print()
-    with ProgressBar("Running Vivado  Synth + Impl + Bitstream") as pb:
-        success, output = run_vivado_batch(tcl_file, vivado_path, source_path)
+    with timed_stage(result, "vivado", reporter, "Running Vivado  Synth + Impl + Bitstream",
+                     long_running=True) as st:
+        success, result.output = run_vivado_batch(tcl_file, vivado_path, source_path)
         if not success:
-            pb.fail()
+            st.fail()
 
     if not success:
         # Pull the last ERROR line out of Vivado output for the user
-        errors = [l.strip() for l in output.splitlines() if "ERROR" in l]
-        if errors:
-            print(f"\n  {errors[-1]}")
-        print(f"\n  Full log: {source_path / 'vivado_project'}")
-        return False
+        errors = extract_errors(result.output)
+        result.add_error("vivado", errors[-1] if errors else "Vivado exited with an error",
+                         hint=f"Full log: {project_dir}")
+        return
 
     # ── success ──────────────────────────────────────────────
     bit_file = project_dir / f"{project_name}.runs" / "impl_1" / f"{design_top}.bit"
-
-    banner("Done")
     if bit_file.exists():
-        print(f"  Bitstream   {bit_file}")
-    print()
+        result.artifacts["bit"] = bit_file
+    result.success = True
+
+    # ── timing / utilization / power summaries ───────────────
+    with timed_stage(result, "reports"):
+        impl_dir = project_dir / f"{project_name}.runs" / "impl_1"
+        result.reports, report_files = collect_reports(impl_dir, design_top)
+        result.artifacts.update(report_files)
+        result.build_hash = build_hash(design_files, constraint_files, board_cfg["part"], design_top)
+        result.previous_reports = record_build(cache_dir, result.build_hash, result.reports)
+
+        summary_file = project_dir / "build_summary.json"
+        with open(summary_file, 'w') as f:
+            json.dump({"build_hash": result.build_hash, "top": design_top,
+                       "part": board_cfg["part"], **result.reports}, f, indent=2)
+        result.artifacts["summary"] = summary_file
 
     # ── open Vivado GUI for programming ──────────────────────
-    if program_device:
-        with Spinner("Opening Vivado Hardware Manager"):
-            opened = open_vivado_gui(project_dir, vivado_path)
-        if opened:
+    if result.program_device:
+        if not toolchain.tool("hw_server"):
+            result.add_warning("program", "hw_server not found next to Vivado; "
+                                          "Hardware Manager may not reach the board")
+        with timed_stage(result, "program", reporter, "Opening Vivado Hardware Manager"):
+            result.hw_manager_opened = open_vivado_gui(project_dir, vivado_path)
+
+
+# ─────────────────────────────────────────────────────────────
+# Terminal rendering
+# ─────────────────────────────────────────────────────────────
+class TerminalReporter(QuietReporter):
+    """Prints the familiar banner/spinner output for build_hardware()"""
+    def __init__(self):
+        self._staged = False
+
+    def plan(self, result):
+        banner("Vivado Hardware Flow")
+        print(f"  Project     {result.project_name}")
+        print(f"  Top         {result.design_top}")
+        print(f"  Target      {result.board.upper()}")
+        print(f"  Vivado      {result.toolchain.version or result.toolchain.vivado}")
+        divider()
+        print("  Files")
+        for df in result.design_files:
+            tag = "  [top]" if df == result.top_file else ""
+            print(f"    {df.name}{tag}")
+        if result.constraint_file:
+            print("  Constraints")
+            print(f"    {result.constraint_file.name}")
+        divider()
+
+    def stage(self, message, long_running=False):
+        if long_running or not self._staged:
+            print()
+        self._staged = True
+        return ProgressBar(message) if long_running else Spinner(message)
+
+    def confirm(self, warning, question="Continue anyway?"):
+        print(f"\n  WARNING: {warning}")
+        return input(f"  {question} (y/n): ").lower() == 'y'
+
+    # (label, section, key, format, +1 if higher is better / -1 if lower is)
+    _REPORT_ROWS = [
+        ("WNS (ns)",   "timing",      "wns",       "{:.3f}", +1),
+        ("TNS (ns)",   "timing",      "tns",       "{:.3f}", +1),
+        ("WHS (ns)",   "timing",      "whs",       "{:.3f}", +1),
+        ("Fmax (MHz)", "timing",      "fmax_mhz",  "{:.1f}", +1),
+        ("LUT",        "utilization", "lut",       "{:g}",   -1),
+        ("FF",         "utilization", "ff",        "{:g}",   -1),
+        ("BRAM",       "utilization", "bram",      "{:g}",   -1),
+        ("DSP",        "utilization", "dsp",       "{:g}",   -1),
+        ("Power (W)",  "power",       "total_w",   "{:.3f}", -1),
+    ]
+
+    def _print_reports(self, reports, previous):
+        """Print this build's timing/area/power next to the previous build's"""
+        print(f"  {'':<12}{'This build':>12}{'Previous':>12}{'Change':>12}")
+        for label, section, key, fmt, better in self._REPORT_ROWS:
+            now = (reports.get(section) or {}).get(key)
+            old = ((previous or {}).get(section) or {}).get(key)
+            if now is None and old is None:
+                continue
+            now_text = fmt.format(now) if now is not None else "-"
+            old_text = fmt.format(old) if old is not None else "-"
+            change = ""
+            if now is not None and old is not None and now != old:
+                change = ("+" if now > old else "") + fmt.format(now - old)
+                if (now - old) * better < 0:
+                    change += " !"
+            print(f"  {label:<12}{now_text:>12}{old_text:>12}{change:>12}")
+        clock = (reports.get("timing") or {}).get("clock")
+        if clock:
+            print(f"  Clock       {clock} @ {reports['timing']['period_ns']:g} ns   (! = worse)")
+
+    def finish(self, result):
+        for warning in result.warnings:
+            if warning.stage != "setup":
+                where = f"{warning.location}: " if warning.location else ""
+                print(f"  WARNING: {where}{warning.message}")
+
+        if not result.success:
+            source_errors = [d for d in result.errors if d.stage == "preflight"]
+            if source_errors:
+                print()
+                for d in source_errors:
+                    where = f"{d.location}: " if d.location else ""
+                    print(f"  {where}{d.message}")
+                print(f"\n  {len(source_errors)} problem(s) found. Use --no-preflight to skip this check.")
+            pin_errors = [d for d in result.errors if d.stage == "constraints"]
+            if pin_errors:
+                print("\n  ERROR: Top-level ports without pin constraints:")
+                for port, props in result.constraints["missing"].items():
+                    print(f"    {port:<14}no {' / '.join(props)}")
+                print(f"\n  Add them to {result.constraint_file.name} before running synthesis")
+            for d in result.errors:
+                if d.stage == "vivado":
+                    print(f"\n  {d.message}")
+                    print(f"\n  {d.hint}")
+                elif d.stage == "setup":
+                    print(f"\n  ERROR: {d.message}")
+                    for hint_line in (d.hint or "").splitlines():
+                        print(f"          {hint_line}")
+            return
+
+        bit_file = result.artifacts.get("bit")
+        banner("Done")
+        if bit_file:
+            print(f"  Bitstream   {bit_file}")
+        print()
+        if any(result.reports.values()):
+            self._print_reports(result.reports, result.previous_reports)
             print()
-            print("  Vivado is opening. When it's ready:")
-            print("    1. Wait for Hardware Manager to connect")
-            print("    2. Right-click the device -> Program Device")
-            print("    3. Bitstream file is already set")
-        else:
-            print("  Could not auto-open Vivado. Open it manually and")
-            print(f"  program {bit_file.name} via Hardware Manager.")
-    print()
-    divider()
-    return True
+
+        if result.program_device:
+            if result.hw_manager_opened:
+                print("  Vivado is opening. When it's ready:")
+                print("    1. Wait for Hardware Manager to connect")
+                print("    2. Right-click the device -> Program Device")
+                print("    3. Bitstream file is already set")
+            else:
+                print("  Could not auto-open Vivado. Open it manually and")
+                print(f"  program {result.design_top}.bit via Hardware Manager.")
+            print()
+        divider()
+
+
+def create_and_program(source_dir, program_device=True, board="basys3", vivado_path=None,
+                       preflight=True, xvlog=False, vivado_version=None):
+    """Create project and run hardware flow with terminal output; returns True on success"""
+    return build_hardware(source_dir, program_device, board, vivado_path,
+                          preflight, xvlog, reporter=TerminalReporter(),
+                          vivado_version=vivado_version).success
 
 
 # ─────────────────────────────────────────────────────────────
@@ -369,6 +712,10 @@ def main():
         print("  Options:")
         print("    --board <n>        Target board (default: basys3)")
         print("    --no-program       Skip opening Hardware Manager")
+        print("    --no-preflight     Skip the Python syntax/lint check before Vivado")
+        print("    --xvlog            Also compile changed files with standalone xvlog")
+        print("    --vivado <path>    Vivado executable (default: found automatically)")
+        print("    --vivado-version <v>  Pick this install when several exist (e.g. 2018.3)")
         print()
         print("  Examples:")
         print("    python run_hardware.py HW3T3")
@@ -380,6 +727,10 @@ def main():
     source_dir     = sys.argv[1]
     board          = "basys3"
     program_device = True
+    preflight      = True
+    xvlog          = False
+    vivado_path    = None
+    vivado_version = None
 
     i = 2
     while i < len(sys.argv):
@@ -389,12 +740,23 @@ def main():
         elif sys.argv[i] == "--no-program":
             program_device = False
             i += 1
+        elif sys.argv[i] == "--no-preflight":
+            preflight = False
+            i += 1
+        elif sys.argv[i] == "--xvlog":
+            xvlog = True
+            i += 1
+        elif sys.argv[i] == "--vivado" and i + 1 < len(sys.argv):
+            vivado_path = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == "--vivado-version" and i + 1 < len(sys.argv):
+            vivado_version = sys.argv[i + 1]
+            i += 2
         else:
             i += 1
 
-    vivado_path = "C:/Xilinx/Vivado/2018.3/bin/vivado.bat"
-
-    success = create_and_program(source_dir, program_device, board, vivado_path)
+    success = create_and_program(source_dir, program_device, board, vivado_path,
+                                 preflight, xvlog, vivado_version)
     sys.exit(0 if success else 1)
 
 
@@ -11,6 +11,15 @@ from pathlib import Path
 import shutil
 import threading
 import time
+import re
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+from vivado_common import (
+    FlowResult, QuietReporter, timed_stage, CACHE_DIR_NAME, preflight_check,
+    prepare_constraints, get_module_parameters, resolve_toolchain,
+    VIVADO_NOT_FOUND_HINT, extract_errors
+)
 
 # Fix Windows PowerShell encoding for unicode output
 if sys.platform == "win32":
@@ -206,114 +215,409 @@ update_compile_order -fileset sim_1
 
 
 # ─────────────────────────────────────────────────────────────
-# Main flow
+# Parameter / define sweep
 # ─────────────────────────────────────────────────────────────
-def create_and_simulate(source_dir, sim_time="1000ns", open_gui=True, board="basys3", vivado_path="vivado"):
-    """Create project and run simulation"""
-
-    design_files, testbench_files, source_path = find_verilog_files(source_dir)
-
-    # ── early validation ─────────────────────────────────────
-    if not design_files:
-        print("\n  ERROR: No Verilog design files found!")
-        return False
-
-    if not testbench_files:
-        print("\n  ERROR: No testbench files found!")
-        print("          Testbench files need '_tb', '_test', or 'testbench' in the name")
-        return False
-
-    design_top    = detect_top_module(design_files[0])
-    testbench_top = detect_top_module(testbench_files[0])
-
-    if not design_top:
-        print(f"\n  ERROR: Could not detect module name in: {design_files[0]}")
-        return False
-    if not testbench_top:
-        print(f"\n  ERROR: Could not detect module name in: {testbench_files[0]}")
-        return False
-
-    project_name = source_path.name
-    project_dir  = source_path / "vivado_project"
-
-    # Constraint file -- script dir first, then source dir
-    script_dir = Path(__file__).parent.resolve()
-    constraint_file = list(script_dir.glob("*.xdc"))
-    if not constraint_file:
-        constraint_file = list(source_path.glob("*.xdc"))
-
-    # ── summary ──────────────────────────────────────────────
-    banner("Vivado Simulation Flow")
-    print(f"  Project     {project_name}")
-    print(f"  Design      {design_top}")
-    print(f"  Testbench   {testbench_top}")
-    print(f"  Sim time    {sim_time}")
-    print(f"  Mode        {'GUI' if open_gui else 'Batch'}")
-    divider()
-    print("  Design files")
-    for df in design_files:
-        print(f"    {df.name}")
-    print("  Testbench files")
-    for tf in testbench_files:
-        print(f"    {tf.name}")
-    if constraint_file:
-        print("  Constraints")
-        print(f"    {constraint_file[0].name}")
+SWEEP_UNDEFINED = "-"   # sweep value that leaves a define unset
+
+
+def parse_sweep_arg(arg):
+    """Parse 'NAME=v1,v2,...' into (name, [values]); None if malformed"""
+    name, sep, values = arg.partition("=")
+    values = [v.strip() for v in values.split(",") if v.strip()]
+    if not sep or not re.match(r'^[A-Za-z_]\w*$', name.strip()) or not values:
+        return None
+    return name.strip(), values
+
+
+def _read_sources(verilog_files):
+    source = ""
+    for vfile in verilog_files:
+        with open(vfile, 'r', errors='replace') as f:
+            source += f.read() + "\n"
+    return source
+
+
+def classify_sweep_names(names, verilog_files):
+    """Split sweep names into (defines, generics).
+    A name used as a `macro or in `ifdef is a define; anything else is
+    passed to the testbench top as a generic (parameter override)."""
+    source = _read_sources(verilog_files)
+    defines, generics = [], []
+    for name in names:
+        if re.search(rf'`(?:(?:ifdef|ifndef|elsif)\s+)?{re.escape(name)}\b', source):
+            defines.append(name)
+        else:
+            generics.append(name)
+    return defines, generics
+
+
+def _unconditional_defines(vfile):
+    """Return {name: line} for `define directives outside any `ifdef/`ifndef"""
+    found = {}
+    depth = 0
+    with open(vfile, 'r', errors='replace') as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.split("//", 1)[0]
+            for directive, name in re.findall(r'`(ifdef|ifndef|endif|define)\b\s*(\w*)', line):
+                if directive in ("ifdef", "ifndef"):
+                    depth += 1
+                elif directive == "endif":
+                    depth = max(0, depth - 1)
+                elif depth == 0 and name:
+                    found.setdefault(name, lineno)
+    return found
+
+
+def check_sweep_names(sweeps, verilog_files, testbench_file, testbench_top):
+    """Check that every sweep name and value can actually change the simulation.
+    sweeps is [(name, [values])]. Returns (errors, warnings) as lists of
+    (message, file, line)."""
+    values = dict(sweeps)
+    defines, generics = classify_sweep_names(list(values), verilog_files)
+    params = get_module_parameters(testbench_file, testbench_top) or {}
+    errors, warnings = [], []
+    for name in generics:
+        kind = params.get(name, (None,))[0]
+        if kind == "localparam":
+            errors.append((f"'{name}' is a localparam of {testbench_top} and cannot be overridden",
+                           testbench_file, None))
+        elif kind is None:
+            errors.append((f"'{name}' is neither a parameter of {testbench_top} nor a `define "
+                           f"used in the sources", testbench_file, None))
+        elif SWEEP_UNDEFINED in values[name]:
+            errors.append((f"'{name}' is a parameter; '{SWEEP_UNDEFINED}' only leaves a `define unset",
+                           testbench_file, None))
+    # A macro that is only tested with `ifdef is defined by every value
+    source = _read_sources(verilog_files)
+    for name in defines:
+        used = re.search(rf'`{re.escape(name)}\b', source)
+        if not used and len(values[name]) > 1 and SWEEP_UNDEFINED not in values[name]:
+            warnings.append((f"`{name} is only tested with `ifdef, so every value defines it; "
+                             f"use {name}={SWEEP_UNDEFINED},1 for a run without it", None, None))
+    for vfile in verilog_files:
+        fixed = _unconditional_defines(vfile)
+        for name in defines:
+            if name in fixed:
+                warnings.append((f"`define {name} is set unconditionally and overrides the sweep value",
+                                 vfile, fixed[name]))
+    return errors, warnings
+
+
+def _run_logged(cmd, cwd, log_file):
+    """Run a tool, appending its output to log_file. Returns success."""
+    proc = subprocess.run(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        universal_newlines=True, cwd=str(cwd)
+    )
+    with open(log_file, 'a') as f:
+        f.write(f"$ {' '.join(cmd)}\n{proc.stdout}\n")
+    return proc.returncode == 0
+
+
+def _first_failure(log_file):
+    """Return the first error/failure line of a sweep log, or None"""
+    with open(log_file, 'r', errors='replace') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith(("ERROR:", "FATAL", "Fatal:")) or "FAIL" in stripped:
+                return stripped
+    return None
+
+
+def run_sweep(sweeps, verilog_files, testbench_top, sim_time, work_dir, tools, jobs=None):
+    """Simulate every combination of sweep values with standalone xsim tools.
+    Sources are compiled once per distinct set of define values into a
+    shared library; each combination is then elaborated with its generics
+    and simulated, concurrently. Returns a list of result dicts."""
+    names = [name for name, _ in sweeps]
+    defines, generics = classify_sweep_names(names, verilog_files)
+    combos = [dict(zip(names, values)) for values in itertools.product(*(v for _, v in sweeps))]
+    jobs = jobs or os.cpu_count() or 1
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    run_tcl = work_dir / "run.tcl"
+    with open(run_tcl, 'w') as f:
+        f.write(f"run {sim_time}\nquit\n")
+
+    # ── compile: one shared library per define set ───────────
+    define_sets = sorted({tuple(combo[d] for d in defines) for combo in combos})
+    libraries = {}
+    for idx, values in enumerate(define_sets):
+        lib_dir = work_dir / f"lib_{idx}"
+        lib_dir.mkdir(exist_ok=True)
+        cmd = [tools["xvlog"], "--nolog"]
+        for name, value in zip(defines, values):
+            if value != SWEEP_UNDEFINED:
+                cmd += ["-d", f"{name}={value}"]
+        libraries[values] = (lib_dir, cmd + [str(v) for v in verilog_files])
+
+    def compile_library(values):
+        lib_dir, cmd = libraries[values]
+        return values, _run_logged(cmd, lib_dir, lib_dir / "compile.log")
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        compiled = dict(pool.map(compile_library, libraries))
+
+    # ── elaborate + simulate each combination ────────────────
+    def simulate(indexed_combo):
+        idx, combo = indexed_combo
+        label = " ".join(f"{k}={v}" for k, v in combo.items())
+        lib_dir, _ = libraries[tuple(combo[d] for d in defines)]
+        run_dir = work_dir / f"run_{idx}"
+        run_dir.mkdir(exist_ok=True)
+        log_file = run_dir / "sim.log"
+        log_file.write_text("")
+        start = time.time()
+
+        if not compiled[tuple(combo[d] for d in defines)]:
+            shutil.copyfile(lib_dir / "compile.log", log_file)
+            ok = False
+        else:
+            with open(run_dir / "xsim.ini", 'w') as f:
+                f.write(f"work={(lib_dir / 'xsim.dir' / 'work').as_posix()}\n")
+            snapshot = f"{testbench_top}_sweep{idx}"
+            cmd = [tools["xelab"], "--nolog", "--initfile", "xsim.ini", "-debug", "off",
+                   "-snapshot", snapshot]
+            for name in generics:
+                cmd += ["-generic_top", f"{name}={combo[name]}"]
+            cmd.append(f"work.{testbench_top}")
+            ok = _run_logged(cmd, run_dir, log_file) and _run_logged(
+                [tools["xsim"], snapshot, "--nolog", "-tclbatch", str(run_tcl)], run_dir, log_file)
+
+        failure = _first_failure(log_file)
+        return {
+            "combination": combo,
+            "label": label,
+            "passed": ok and failure is None,
+            "seconds": time.time() - start,
+            "message": failure or ("" if ok else "tool exited with an error"),
+            "log": log_file,
+        }
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(simulate, enumerate(combos)))
+
+
+def print_sweep_table(results):
+    """Print one row per sweep combination"""
+    width = max([len("Combination")] + [len(r["label"]) for r in results])
+    print(f"  {'Combination':<{width}}  Result  Time")
     divider()
+    for r in results:
+        status = "PASS" if r["passed"] else "FAIL"
+        print(f"  {r['label']:<{width}}  {status:<6}  {r['seconds']:.1f}s")
+        if not r["passed"]:
+            print(f"  {'':<{width}}    {r['message'][:W - width - 6]}")
+            print(f"  {'':<{width}}    log: {r['log']}")
+
+
+# ─────────────────────────────────────────────────────────────
+# Main flow
+# ─────────────────────────────────────────────────────────────
+class SimulationResult(FlowResult):
+    """Result of simulate(). Adds to FlowResult:
+    testbench_files [Path], testbench_top str or None
+    sim_time        str
+    mode            str  -- 'gui', 'batch' or 'sweep'
+    sweep_spec      [(name, [values])] -- the requested sweep, if any
+    sweep           [dict] -- one row per sweep combination (see run_sweep)
+    """
+    def __init__(self, source_dir, board, sim_time, mode, sweep_spec=None):
+        super().__init__(source_dir, board)
+        self.testbench_files = []
+        self.testbench_top = None
+        self.sim_time = sim_time
+        self.mode = mode
+        self.sweep_spec = sweep_spec or []
+        self.sweep = []
+
+
+def simulate(source_dir, sim_time="1000ns", open_gui=False, board="basys3", vivado_path=None,
+             preflight=True, xvlog=False, sweep=None, jobs=None, reporter=None, vivado_version=None,
+             toolchain_cache_dir=None):
+    """Create project and run simulation, returning a SimulationResult.
+    Nothing is printed unless a reporter (e.g. TerminalReporter()) is given.
+    sweep is a list of (name, [values]) pairs; when given, every
+    combination is simulated in batch with the standalone xsim tools.
+    Without vivado_path, Vivado is located with resolve_toolchain(), which
+    caches the lookup in toolchain_cache_dir (default: next to this script)."""
+    reporter = reporter or QuietReporter()
+    mode = "sweep" if sweep else ("gui" if open_gui else "batch")
+    result = SimulationResult(source_dir, board, sim_time, mode, sweep)
+    try:
+        _simulate(result, vivado_path, vivado_version, toolchain_cache_dir, preflight, xvlog, sweep, jobs,
+                  reporter)
+    finally:
+        reporter.finish(result)
+    return result
+
+
+def _simulate(result, vivado_path, vivado_version, toolchain_cache_dir, preflight, xvlog, sweep, jobs,
+              reporter):
+    with timed_stage(result, "toolchain"):
+        toolchain = resolve_toolchain(vivado_path, vivado_version, toolchain_cache_dir)
+        result.toolchain = toolchain
+        result.cache_hits["toolchain"] = int(bool(toolchain and toolchain.cached))
+    if not toolchain:
+        wanted = vivado_version or os.environ.get("VIVADO_VERSION")
+        where = f" in {vivado_path}" if vivado_path else ""
+        result.add_error("setup", f"Vivado {wanted + ' ' if wanted else ''}executable not found{where}!",
+                         hint=VIVADO_NOT_FOUND_HINT)
+        return
+    vivado_path = toolchain.vivado
+
+    with timed_stage(result, "discover"):
+        design_files, testbench_files, source_path = find_verilog_files(result.source_dir)
+        result.design_files = design_files
+        result.testbench_files = testbench_files
+
+        # ── early validation ─────────────────────────────────
+        if not design_files:
+            result.add_error("setup", "No Verilog design files found!")
+            return
+        if not testbench_files:
+            result.add_error("setup", "No testbench files found!",
+                             hint="Testbench files need '_tb', '_test', or 'testbench' in the name")
+            return
+
+        result.design_top    = detect_top_module(design_files[0])
+        result.testbench_top = detect_top_module(testbench_files[0])
+        if not result.design_top:
+            result.add_error("setup", f"Could not detect module name in: {design_files[0]}")
+            return
+        if not result.testbench_top:
+            result.add_error("setup", f"Could not detect module name in: {testbench_files[0]}")
+            return
+
+        # Constraint file -- script dir first, then source dir
+        script_dir = Path(__file__).parent.resolve()
+        constraint_file = list(script_dir.glob("*.xdc"))
+        if not constraint_file:
+            constraint_file = list(source_path.glob("*.xdc"))
+        if constraint_file:
+            result.constraint_file = constraint_file[0]
+
+    project_name = result.project_name
+    project_dir  = result.project_dir
+    design_top, testbench_top = result.design_top, result.testbench_top
+    cache_dir = source_path / CACHE_DIR_NAME
+    reporter.plan(result)
+
+    # ── pre-flight ───────────────────────────────────────────
+    if preflight:
+        xvlog_path = None
+        if xvlog:
+            xvlog_path = toolchain.tool("xvlog")
+            if not xvlog_path:
+                result.add_warning("preflight", "xvlog not found, using the Python scanner only")
+        verilog_files = design_files + testbench_files
+        with timed_stage(result, "preflight", reporter, "Pre-flight check") as st:
+            problems, warnings, rechecked = preflight_check(verilog_files, cache_dir, xvlog_path)
+            result.cache_hits["preflight"] = len(verilog_files) - len(rechecked)
+            st.message = f"Pre-flight check  ({len(rechecked)}/{len(verilog_files)} files rescanned)"
+            for vfile, line, msg in problems:
+                result.add_error("preflight", msg, file=vfile, line=line)
+            for vfile, line, msg in warnings:
+                result.add_warning("preflight", msg, file=vfile, line=line)
+            if problems:
+                st.fail()
+        if problems:
+            return
+
+    # ── constraints: keep only what applies to the design top ─
+    if result.constraint_file:
+        with timed_stage(result, "constraints"):
+            xdc_file, xdc_info = prepare_constraints(result.constraint_file, design_files[0],
+                                                     design_top, cache_dir)
+            result.cache_hits["xdc"] = int(xdc_info["cached"])
+            result.artifacts["xdc"] = xdc_file
+        constraint_file = [xdc_file]
+    else:
+        constraint_file = []
 
     # ── board config ─────────────────────────────────────────
     board_configs = {
         "basys3": {"part": "xc7a35tcpg236-1",  "board_part": "digilentinc.com:basys3:part0:1.2"},
         "arty":   {"part": "xc7a35ticsg324-1L","board_part": "digilentinc.com:arty-a7-35:part0:1.1"},
     }
-    if board not in board_configs:
-        board = "basys3"
-    board_cfg = board_configs[board]
+    if result.board not in board_configs:
+        result.board = "basys3"
+    board_cfg = board_configs[result.board]
+
+    # ── sweep names must reach the testbench ─────────────────
+    if sweep:
+        errors, warnings = check_sweep_names(sweep, design_files + testbench_files,
+                                             testbench_files[0], testbench_top)
+        for msg, vfile, line in warnings:
+            result.add_warning("sweep", msg, file=vfile, line=line)
+        for msg, vfile, line in errors:
+            result.add_error("sweep", msg, file=vfile, line=line)
+        if errors:
+            return
 
     # ── clean old project ────────────────────────────────────
     if project_dir.exists():
-        with Spinner("Cleaning old project"):
+        with timed_stage(result, "clean", reporter, "Cleaning old project"):
             shutil.rmtree(project_dir)
 
+    # ── sweep mode ───────────────────────────────────────────
+    if sweep:
+        tools = {name: toolchain.tool(name) for name in ("xvlog", "xelab", "xsim")}
+        missing = [name for name, path in tools.items() if not path]
+        if missing:
+            result.add_error("sweep", f"Sweep needs {', '.join(missing)} next to Vivado or on the PATH")
+            return
+
+        with timed_stage(result, "sweep", reporter, "Running sweep", long_running=True) as st:
+            result.sweep = run_sweep(sweep, design_files + testbench_files, testbench_top,
+                                     result.sim_time, project_dir / "sweep", tools, jobs)
+            for row in result.sweep:
+                if not row["passed"]:
+                    result.add_error("sweep", f"{row['label']}: {row['message']}", file=row["log"])
+            if result.errors:
+                st.fail()
+        result.artifacts["sweep"] = project_dir / "sweep"
+        result.success = not result.errors
+        return
+
     # ── shared project Tcl ───────────────────────────────────
-    tcl_project = build_tcl_project(
-        project_name, project_dir, board_cfg,
-        design_files, testbench_files, constraint_file,
-        design_top, testbench_top
-    )
+    with timed_stage(result, "tcl"):
+        tcl_project = build_tcl_project(
+            project_name, project_dir, board_cfg,
+            design_files, testbench_files, constraint_file,
+            design_top, testbench_top
+        )
 
     # ── GUI mode ─────────────────────────────────────────────
-    if open_gui:
-        tcl_script = tcl_project + f"""
+    if result.mode == "gui":
+        with timed_stage(result, "tcl"):
+            tcl_script = tcl_project + f"""
 launch_simulation -mode behavioral
 
-run {sim_time}
+run {result.sim_time}
 
 catch {{
     add_wave {{/*}}
 }}
 """
-        tcl_file = source_path / "run_sim_gui.tcl"
-        with open(tcl_file, 'w') as f:
-            f.write(tcl_script)
+            tcl_file = source_path / "run_sim_gui.tcl"
+            with open(tcl_file, 'w') as f:
+                f.write(tcl_script)
+            result.artifacts["tcl"] = tcl_file
 
-        print()
-        with Spinner("Opening Vivado GUI"):
+        with timed_stage(result, "vivado", reporter, "Opening Vivado GUI"):
             cmd = [vivado_path, "-mode", "gui", "-source", str(tcl_file)]
             # GUI mode blocks until the user closes Vivado
             subprocess.run(cmd, cwd=str(source_path))
-
-        banner("Done")
-        print("  Vivado closed. Simulation complete.")
-        divider()
-        return True
+        result.success = True
+        return
 
     # ── Batch mode ───────────────────────────────────────────
-    else:
+    with timed_stage(result, "tcl"):
         tcl_script = tcl_project + f"""
 launch_simulation -mode behavioral
 
-run {sim_time}
+run {result.sim_time}
 
 save_wave_config
 
@@ -325,34 +629,127 @@ exit 0
         tcl_file = source_path / "run_sim.tcl"
         with open(tcl_file, 'w') as f:
             f.write(tcl_script)
+        result.artifacts["tcl"] = tcl_file
 
-        print()
-        with ProgressBar("Running simulation") as pb:
-            success, output = run_vivado_batch(tcl_file, vivado_path, source_path)
-            if not success:
-                pb.fail()
-
+    with timed_stage(result, "vivado", reporter, "Running simulation", long_running=True) as st:
+        success, result.output = run_vivado_batch(tcl_file, vivado_path, source_path)
         if not success:
-            errors = [l.strip() for l in output.splitlines() if "ERROR" in l]
-            if errors:
-                print(f"\n  {errors[-1]}")
-            print(f"\n  Full log: {project_dir}")
-            return False
+            st.fail()
 
-        # ── find and report waveform file ────────────────────
-        banner("Done")
-        sim_dir = project_dir / f"{project_name}.sim" / "sim_1" / "behav" / "xsim"
-        if sim_dir.exists():
-            wdb_files = list(sim_dir.glob("*.wdb"))
-            if wdb_files:
-                print(f"  Waveform    {wdb_files[0]}")
+    if not success:
+        errors = extract_errors(result.output)
+        result.add_error("vivado", errors[-1] if errors else "Vivado exited with an error",
+                         hint=f"Full log: {project_dir}")
+        return
+
+    # ── find waveform file ───────────────────────────────────
+    sim_dir = project_dir / f"{project_name}.sim" / "sim_1" / "behav" / "xsim"
+    if sim_dir.exists():
+        wdb_files = list(sim_dir.glob("*.wdb"))
+        if wdb_files:
+            result.artifacts["wdb"] = wdb_files[0]
+    result.success = True
+
+
+# ─────────────────────────────────────────────────────────────
+# Terminal rendering
+# ─────────────────────────────────────────────────────────────
+class TerminalReporter(QuietReporter):
+    """Prints the familiar banner/spinner output for simulate()"""
+    def __init__(self):
+        self._staged = False
+
+    def plan(self, result):
+        banner("Vivado Simulation Flow")
+        print(f"  Project     {result.project_name}")
+        print(f"  Design      {result.design_top}")
+        print(f"  Testbench   {result.testbench_top}")
+        print(f"  Sim time    {result.sim_time}")
+        print(f"  Vivado      {result.toolchain.version or result.toolchain.vivado}")
+        if result.sweep_spec:
+            runs = len(list(itertools.product(*(v for _, v in result.sweep_spec))))
+            print(f"  Mode        Sweep ({runs} runs)")
+            for name, values in result.sweep_spec:
+                print(f"    {name:<10}{', '.join(values)}")
+        else:
+            print(f"  Mode        {'GUI' if result.mode == 'gui' else 'Batch'}")
+        divider()
+        print("  Design files")
+        for df in result.design_files:
+            print(f"    {df.name}")
+        print("  Testbench files")
+        for tf in result.testbench_files:
+            print(f"    {tf.name}")
+        if result.constraint_file:
+            print("  Constraints")
+            print(f"    {result.constraint_file.name}")
+        divider()
+
+    def stage(self, message, long_running=False):
+        if long_running or not self._staged:
+            print()
+        self._staged = True
+        return ProgressBar(message) if long_running else Spinner(message)
+
+    def confirm(self, warning, question="Continue anyway?"):
+        print(f"\n  WARNING: {warning}")
+        return input(f"  {question} (y/n): ").lower() == 'y'
+
+    def finish(self, result):
+        for warning in result.warnings:
+            where = f"{warning.location}: " if warning.location else ""
+            print(f"  WARNING: {where}{warning.message}")
+
+        if not result.success:
+            source_errors = [d for d in result.errors if d.line]
+            if source_errors:
                 print()
-                print("  To view:")
-                print(f"    vivado -mode gui")
-                print(f"    File -> Open Waveform Database -> {wdb_files[0].name}")
+                for d in source_errors:
+                    print(f"  {d.location}: {d.message}")
+                print(f"\n  {len(source_errors)} problem(s) found. Use --no-preflight to skip this check.")
+            for d in result.errors:
+                if d.line:
+                    continue
+                if d.stage == "sweep" and result.sweep:
+                    continue
+                if d.stage == "vivado":
+                    print(f"\n  {d.message}")
+                    print(f"\n  {d.hint}")
+                    continue
+                print(f"\n  ERROR: {d.message}")
+                for hint_line in (d.hint or "").splitlines():
+                    print(f"          {hint_line}")
+            if not result.sweep:
+                return
+
+        if result.mode == "sweep":
+            banner("Sweep results")
+            print_sweep_table(result.sweep)
+            divider()
+            return
+
+        banner("Done")
+        if result.mode == "gui":
+            print("  Vivado closed. Simulation complete.")
+            divider()
+            return
+        wdb = result.artifacts.get("wdb")
+        if wdb:
+            print(f"  Waveform    {wdb}")
+            print()
+            print("  To view:")
+            print(f"    vivado -mode gui")
+            print(f"    File -> Open Waveform Database -> {wdb.name}")
         print()
         divider()
-        return True
+
+
+def create_and_simulate(source_dir, sim_time="1000ns", open_gui=True, board="basys3", vivado_path=None,
+                        preflight=True, xvlog=False, sweep=None, jobs=None, vivado_version=None):
+    """Create project and run simulation with terminal output; returns True on success"""
+    return simulate(source_dir, sim_time, open_gui, board, vivado_path,
+                    preflight, xvlog, sweep, jobs, reporter=TerminalReporter(),
+                    vivado_version=vivado_version).success
 
 
 # ─────────────────────────────────────────────────────────────
@@ -368,19 +765,34 @@ def main():
         print("    --gui              Open waveform viewer automatically (default)")
         print("    --no-gui           Run in batch mode, save waveform for later")
         print("    --board <n>        Target board (default: basys3)")
+        print("    --no-preflight     Skip the Python syntax/lint check before Vivado")
+        print("    --xvlog            Also compile changed files with standalone xvlog")
+        print("    --sweep NAME=v1,v2 Simulate once per value (repeatable; parameters")
+        print("                       become generics, `define names become defines;")
+        print("                       the value - leaves a define unset)")
+        print("    --jobs <n>         Parallel sweep simulations (default: CPU count)")
+        print("    --vivado <path>    Vivado executable (default: found automatically)")
+        print("    --vivado-version <v>  Pick this install when several exist (e.g. 2018.3)")
         print()
         print("  Examples:")
         print("    python run_simulation_gui.py .")
         print("    python run_simulation_gui.py . --time 500ns")
         print("    python run_simulation_gui.py . --no-gui")
         print("    python run_simulation_gui.py HW3T3 --time 10us")
+        print("    python run_simulation_gui.py counter --sweep N=2,4,8")
         print()
         sys.exit(1)
 
-    source_dir = sys.argv[1]
-    sim_time   = "1000ns"
-    board      = "basys3"
-    open_gui   = True
+    source_dir     = sys.argv[1]
+    sim_time       = "1000ns"
+    board          = "basys3"
+    open_gui       = True
+    preflight      = True
+    xvlog          = False
+    sweep          = []
+    jobs           = None
+    vivado_path    = None
+    vivado_version = None
 
     i = 2
     while i < len(sys.argv):
@@ -396,12 +808,36 @@ def main():
         elif sys.argv[i] == "--gui":
             open_gui = True
             i += 1
+        elif sys.argv[i] == "--no-preflight":
+            preflight = False
+            i += 1
+        elif sys.argv[i] == "--xvlog":
+            xvlog = True
+            i += 1
+        elif sys.argv[i] == "--sweep" and i + 1 < len(sys.argv):
+            parsed = parse_sweep_arg(sys.argv[i + 1])
+            if not parsed:
+                print(f"\n  ERROR: Bad --sweep value '{sys.argv[i + 1]}' (expected NAME=v1,v2,...)")
+                sys.exit(1)
+            sweep.append(parsed)
+            i += 2
+        elif sys.argv[i] == "--jobs" and i + 1 < len(sys.argv):
+            if not sys.argv[i + 1].isdigit() or int(sys.argv[i + 1]) < 1:
+                print(f"\n  ERROR: Bad --jobs value '{sys.argv[i + 1]}' (expected a number of 1 or more)")
+                sys.exit(1)
+            jobs = int(sys.argv[i + 1])
+            i += 2
+        elif sys.argv[i] == "--vivado" and i + 1 < len(sys.argv):
+            vivado_path = sys.argv[i + 1]
+            i += 2
+        elif sys.argv[i] == "--vivado-version" and i + 1 < len(sys.argv):
+            vivado_version = sys.argv[i + 1]
+            i += 2
         else:
             i += 1
 
-    vivado_path = "C:/Xilinx/Vivado/2018.3/bin/vivado.bat"
-
-    success = create_and_simulate(source_dir, sim_time, open_gui, board, vivado_path)
+    success = create_and_simulate(source_dir, sim_time, open_gui, board, vivado_path,
+                                  preflight, xvlog, sweep, jobs, vivado_version)
     sys.exit(0 if success else 1)
 
 
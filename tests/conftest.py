@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# The flow scripts are run from the repo root, not installed
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def repo_root():
+    return REPO_ROOT
@@ -0,0 +1,164 @@
+"""XDC parsing and port-aware pruning (parse_xdc / get_top_ports / prune_constraints)"""
+import textwrap
+
+from vivado_common import (get_module_parameters, get_top_ports, parse_xdc, prepare_constraints,
+                           prune_constraints)
+
+
+MASTER_XDC = """\
+## Clock signal
+set_property PACKAGE_PIN W5 [get_ports clk]
+set_property IOSTANDARD LVCMOS33 [get_ports clk]
+create_clock -period 10.000 -name sys_clk_pin -waveform {0.000 5.000} -add [get_ports clk]
+
+## Switches
+set_property PACKAGE_PIN V17 [get_ports {sw[0]}]
+set_property IOSTANDARD LVCMOS33 [get_ports {sw[0]}]
+set_property PACKAGE_PIN V16 [get_ports {sw[1]}]
+set_property IOSTANDARD LVCMOS33 [get_ports {sw[1]}]
+
+## LEDs
+set_property PACKAGE_PIN U16 [get_ports {led[0]}]
+set_property IOSTANDARD LVCMOS33 [get_ports {led[0]}]
+
+## Pmod Header JA
+#set_property PACKAGE_PIN J1 [get_ports {JA[0]}]
+#set_property IOSTANDARD LVCMOS33 [get_ports {JA[0]}]
+#set_property PACKAGE_PIN L2 [get_ports {JA[1]}]
+#set_property IOSTANDARD LVCMOS33 [get_ports {JA[1]}]
+
+## Configuration options
+set_property CONFIG_VOLTAGE 3.3 [current_design]
+set_property CFGBVS VCC [current_design]
+"""
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(textwrap.dedent(text))
+    return path
+
+
+def kept_lines(kept):
+    return [cmd["line"] for cmd in kept]
+
+
+def test_parse_xdc(tmp_path):
+    commands = parse_xdc(write(tmp_path, "m.xdc", MASTER_XDC))
+    by_line = {cmd["line"]: cmd for cmd in commands}
+
+    assert by_line[2]["ports"] == [["clk", None]]
+    assert by_line[2]["props"] == ["PACKAGE_PIN"]
+    assert by_line[4]["props"] == ["CLOCK"]
+    assert by_line[7]["ports"] == [["sw", 0]]
+    assert by_line[8]["props"] == ["IOSTANDARD"]
+    assert by_line[17]["commented"] and by_line[17]["ports"] == [["JA", 0]]
+    assert by_line[17]["text"] == "set_property PACKAGE_PIN J1 [get_ports {JA[0]}]"
+    assert by_line[23]["ports"] == [] and not by_line[23]["commented"]
+    # comment lines that are not commands are dropped
+    assert 1 not in by_line and 16 not in by_line
+
+
+def test_parse_xdc_joins_continuation_lines(tmp_path):
+    commands = parse_xdc(write(tmp_path, "m.xdc", """\
+        set_property -dict { PACKAGE_PIN W5 \\
+                             IOSTANDARD LVCMOS33 } [get_ports clk]
+    """))
+    assert len(commands) == 1
+    assert commands[0]["ports"] == [["clk", None]]
+    assert commands[0]["props"] == ["PACKAGE_PIN", "IOSTANDARD"]
+
+
+def test_prune_keeps_only_used_ports(tmp_path):
+    commands = parse_xdc(write(tmp_path, "m.xdc", MASTER_XDC))
+    kept, missing = prune_constraints(commands, {"clk": None, "sw": [0], "led": [0]})
+    assert kept_lines(kept) == [2, 3, 4, 7, 8, 13, 14, 23, 24]
+    assert missing == {}
+
+
+def test_prune_whole_bus_reference(tmp_path):
+    xdc = write(tmp_path, "m.xdc", "set_property IOSTANDARD LVCMOS33 [get_ports sw]\n"
+                                   "set_property PACKAGE_PIN V17 [get_ports {sw[0]}]\n")
+    kept, missing = prune_constraints(parse_xdc(xdc), {"sw": [0, 1]})
+    assert kept_lines(kept) == [1, 2]
+    assert missing == {"sw[1]": ["PACKAGE_PIN"]}
+
+
+def test_prune_uses_commented_pins_for_matching_ports(tmp_path):
+    commands = parse_xdc(write(tmp_path, "m.xdc", MASTER_XDC))
+    kept, missing = prune_constraints(commands, {"JA": [0, 1]})
+    assert kept_lines(kept) == [17, 18, 19, 20, 23, 24]
+    assert all(cmd["commented"] for cmd in kept[:4])
+    assert missing == {}
+
+
+def test_prune_prefers_active_over_commented(tmp_path):
+    xdc = write(tmp_path, "m.xdc", "#set_property PACKAGE_PIN A1 [get_ports led]\n"
+                                   "set_property PACKAGE_PIN U16 [get_ports led]\n")
+    kept, _ = prune_constraints(parse_xdc(xdc), {"led": None})
+    assert kept_lines(kept) == [2]
+
+
+def test_prune_reports_unconstrained_ports(tmp_path):
+    commands = parse_xdc(write(tmp_path, "m.xdc", MASTER_XDC))
+    _, missing = prune_constraints(commands, {"led": [0, 1], "btn": None})
+    assert missing == {"led[1]": ["PACKAGE_PIN", "IOSTANDARD"],
+                       "btn": ["PACKAGE_PIN", "IOSTANDARD"]}
+
+
+def test_get_top_ports(tmp_path):
+    vfile = write(tmp_path, "top.v", """
+        module top #(parameter W = 4) (
+            input clk,
+            input [W-1:0] sw,
+            output reg [1:0] led,
+            output [BAD:0] seg
+        );
+        endmodule
+        module other(input x);
+        endmodule
+    """)
+    assert get_top_ports(vfile, "top") == {"clk": None, "sw": [0, 1, 2, 3],
+                                           "led": [0, 1], "seg": "?"}
+    assert get_top_ports(vfile, "missing") is None
+
+
+def test_get_top_ports_non_ansi(tmp_path):
+    vfile = write(tmp_path, "top.v", """
+        module top(clk, led);
+            parameter N = 2;
+            input clk;
+            output [N-1:0] led;
+        endmodule
+    """)
+    assert get_top_ports(vfile, "top") == {"clk": None, "led": [0, 1]}
+
+
+def test_get_module_parameters(tmp_path):
+    vfile = write(tmp_path, "tb.v", """
+        module tb #(parameter W = 4, parameter D = W * 2) ();
+            parameter N = 8;
+            localparam M = N - 1, K = M + X;
+        endmodule
+    """)
+    assert get_module_parameters(vfile, "tb") == {
+        "W": ("parameter", 4), "D": ("parameter", 8), "N": ("parameter", 8),
+        "M": ("localparam", 7), "K": ("localparam", None)}
+    assert get_module_parameters(vfile, "missing") is None
+
+
+def test_prepare_constraints_against_repo_master(tmp_path, repo_root):
+    top = write(tmp_path, "top.v", """
+        module top(input clk, input [1:0] sw, output [1:0] led);
+        endmodule
+    """)
+    xdc, info = prepare_constraints(repo_root / "Basys3_Master.xdc", top, "top", tmp_path / "cache")
+    assert xdc == tmp_path / "cache" / "top_constraints.xdc"
+    assert info["missing"] == {} and not info["cached"]
+    assert info["kept"] < info["total"]
+    text = xdc.read_text()
+    assert "[get_ports {sw[1]}]" in text and "[get_ports {sw[2]}]" not in text
+    assert "create_clock" in text
+
+    assert prepare_constraints(repo_root / "Basys3_Master.xdc", top, "top",
+                               tmp_path / "cache")[1]["cached"]
@@ -0,0 +1,25 @@
+"""The benchmark's fake Vivado: recorded transcripts match the shipped ones"""
+import json
+
+from benchmarks import fake_vivado
+from benchmarks.bench import make_fake_toolchain
+
+
+def test_record_writes_the_shipped_schema(tmp_path):
+    xvlog = tmp_path / "bin" / "xvlog"
+    make_fake_toolchain(xvlog.parent)
+    out_file = tmp_path / "xvlog.json"
+    assert fake_vivado.record(str(out_file), [str(xvlog), "top.v"]) == 0
+
+    recorded = json.loads(out_file.read_text())
+    shipped = json.loads((fake_vivado.TRANSCRIPT_DIR / "xvlog.json").read_text())
+    assert list(recorded) == list(shipped)
+    assert (recorded["tool"], recorded["flow"], recorded["source"]) == ("xvlog", "xvlog", "recorded")
+    assert [text for _, text in recorded["lines"]] == [text for _, text in shipped["lines"]]
+
+
+def test_shipped_transcripts_are_labelled():
+    for transcript in fake_vivado.TRANSCRIPT_DIR.glob("*.json"):
+        data = json.loads(transcript.read_text())
+        assert data["flow"] == transcript.stem
+        assert data["source"] in ("synthetic", "recorded")
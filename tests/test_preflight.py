@@ -0,0 +1,359 @@
+"""Pre-flight Verilog scanner (scan_verilog_source / preflight_check)"""
+import json
+import sys
+import textwrap
+
+import pytest
+
+from vivado_common import preflight_check, scan_verilog_source
+
+
+def scan(source):
+    return scan_verilog_source(textwrap.dedent(source))
+
+
+def errors(source):
+    return scan(source)["errors"]
+
+
+# ─────────────────────────────────────────────────────────────
+# Clean sources produce no errors
+# ─────────────────────────────────────────────────────────────
+CLEAN_SOURCES = {
+    "ansi header": """
+        module adder #(parameter N = 4) (
+            input  wire [N-1:0] a, b,
+            output reg  [N:0]   sum
+        );
+            always @(*) sum = a + b;
+        endmodule
+    """,
+    "non-ansi header": """
+        module mux(a, b, sel, y);
+            input a, b;
+            input sel;
+            output y;
+            assign y = sel ? b : a;
+        endmodule
+    """,
+    "generate, function and task": """
+        module gen #(parameter N = 4) (input [N-1:0] x, output [N-1:0] y);
+            genvar i;
+            generate
+                for (i = 0; i < N; i = i + 1) begin : bits
+                    assign y[i] = invert(x[i]);
+                end
+            endgenerate
+            function invert;
+                input b;
+                begin
+                    invert = ~b;
+                end
+            endfunction
+            task show;
+                input [N-1:0] v;
+                $display("%b", v);
+            endtask
+        endmodule
+    """,
+    "delays, case and named blocks": """
+        `timescale 1ns / 1ps
+        module tb;
+            reg clk = 0;
+            reg [1:0] s;
+            always #5 clk = ~clk;
+            initial begin : stimulus
+                s = 2'b00;
+                #10;
+                s = 2'b01;
+                #10 s = 2'b10;
+                case (s)
+                    2'b00: s = 2'b11;
+                    default: s = 2'b00;
+                endcase
+                $finish;
+            end
+        endmodule
+    """,
+    "instance lists and parameter overrides": """
+        module top(input [3:0] a, b, output [1:0] y);
+            cell #(.W(2)) u0(.a(a[1:0]), .y(y[0])), u1(.a(a[3:2]), .y(y[1]));
+            cell u2(b[0], );
+        endmodule
+    """,
+    "comments and strings": """
+        module m;
+            // module fake( ; endmodule
+            /* begin begin
+               end */
+            initial $display("end ; module (");
+        endmodule
+    """,
+    "attributes": """
+        (* keep_hierarchy = "yes" *)
+        module top(input a, output y);
+            (* DONT_TOUCH = "yes" *) sub u1 (.a(a));
+            (* mark_debug = "true" *) wire w;
+            always @(*) begin end
+        endmodule
+    """,
+    "instance arrays": """
+        module top(input [3:0] a, output [3:0] y);
+            inv u[3:0] (.a(a), .y(y));
+            inv v[1:0] (.a(a[1:0]), .y()), w[1:0] (a[3:2], y[3:2]);
+        endmodule
+    """,
+    "alternative headers under ifdef": """
+        `ifdef WIDE
+        module t(input [7:0] a);
+        `elsif NARROW
+        module t(input [1:0] a);
+        `else
+        module t(input [3:0] a);
+        `endif
+        `ifndef SIM
+            wire x;
+        `endif
+        endmodule
+    """,
+}
+
+
+@pytest.mark.parametrize("source", CLEAN_SOURCES.values(), ids=list(CLEAN_SOURCES))
+def test_clean_source_has_no_errors(source):
+    assert errors(source) == []
+
+
+def test_only_the_first_ifdef_branch_is_scanned():
+    result = scan(CLEAN_SOURCES["alternative headers under ifdef"])
+    assert result["modules"] == {"t": {"line": 3, "ports": ["a"]}}
+
+
+def test_instance_arrays_are_recorded():
+    result = scan(CLEAN_SOURCES["instance arrays"])
+    assert [(i["name"], i["ports"], i["positional"]) for i in result["instances"]] == [
+        ("u", ["a", "y"], 0), ("v", ["a", "y"], 0), ("w", [], 2)]
+
+
+def test_modules_and_instances_are_recorded():
+    result = scan(CLEAN_SOURCES["instance lists and parameter overrides"])
+    assert result["modules"] == {"top": {"line": 2, "ports": ["a", "b", "y"]}}
+    assert [(i["module"], i["name"], i["ports"], i["positional"]) for i in result["instances"]] == [
+        ("cell", "u0", ["a", "y"], 0),
+        ("cell", "u1", ["a", "y"], 0),
+        ("cell", "u2", [], 2),
+    ]
+
+
+def test_non_ansi_ports_are_recorded():
+    assert scan(CLEAN_SOURCES["non-ansi header"])["modules"]["mux"]["ports"] == ["a", "b", "sel", "y"]
+
+
+# ─────────────────────────────────────────────────────────────
+# Each error message, with its line
+# ─────────────────────────────────────────────────────────────
+ERROR_CASES = {
+    "missing endmodule": ("""
+        module a;
+            wire x;
+        """, [[2, "module 'a' is missing endmodule"]]),
+    "module without name": ("""
+        module (x);
+        endmodule
+        """, [[2, "expected module name after 'module'"],
+              [2, "unexpected '(' outside module"],
+              [3, "endmodule without matching module"]]),
+    "header without semicolon": ("""
+        module a(input x)
+            wire y;
+        endmodule
+        """, [[2, "expected ';' after module 'a' header"]]),
+    "defined twice": ("""
+        module a; endmodule
+        module a; endmodule
+        """, [[3, "module 'a' defined twice"]]),
+    "stray endmodule": ("""
+        module a; endmodule
+        endmodule
+        """, [[3, "endmodule without matching module"]]),
+    "code outside module": ("""
+        wire x;
+        module a; endmodule
+        """, [[2, "unexpected 'wire' outside module"]]),
+    "unclosed begin": ("""
+        module a;
+            initial begin
+                $display("x");
+        endmodule
+        """, [[3, "'begin' is never closed before endmodule"]]),
+    "closer without opener": ("""
+        module a;
+            initial $display("x");
+            end
+        endmodule
+        """, [[4, "'end' without matching opener"]]),
+    "mismatched closer": ("""
+        module a(input [1:0] s);
+            always @(*) begin
+                case (s)
+                    default: ;
+            end
+        endmodule
+        """, [[6, "'end' closes 'case' opened at line 4"],
+              [3, "'begin' is never closed before endmodule"]]),
+    "unbalanced paren": ("""
+        module a;
+            wire y = (1 + 2;
+        endmodule
+        """, [[3, "unbalanced '('"]]),
+    "unmatched closing paren": ("""
+        module a;
+            wire y = 1 + 2);
+        endmodule
+        """, [[3, "unmatched ')'"]]),
+    "unbalanced header paren": ("""
+        module a(input x;
+        endmodule
+        """, [[2, "unbalanced '(' in port list of 'a'"],
+              [2, "expected ';' after module 'a' header"]]),
+    "undeclared non-ansi port": ("""
+        module a(x, y);
+            input x;
+        endmodule
+        """, [[2, "port 'y' has no input/output declaration"]]),
+    "instance without semicolon": ("""
+        module a;
+            b u0(.x(1))
+            wire y;
+        endmodule
+        """, [[3, "expected ';' after instance 'u0'"]]),
+}
+
+
+@pytest.mark.parametrize("source, expected", ERROR_CASES.values(), ids=list(ERROR_CASES))
+def test_error_message_and_line(source, expected):
+    assert errors(source) == expected
+
+
+def test_missing_semicolon_is_a_warning():
+    result = scan("""
+        module a;
+            wire x
+            wire y;
+        endmodule
+    """)
+    assert result["errors"] == []
+    assert result["warnings"] == [[3, "expected ';' after 'x'"]]
+
+
+# ─────────────────────────────────────────────────────────────
+# Cross-file checks and caching
+# ─────────────────────────────────────────────────────────────
+def write(tmp_path, name, source):
+    path = tmp_path / name
+    path.write_text(textwrap.dedent(source))
+    return path
+
+
+def test_cross_file_checks(tmp_path):
+    leaf = write(tmp_path, "leaf.v", """
+        module leaf(input a, output y);
+            assign y = a;
+        endmodule
+    """)
+    top = write(tmp_path, "top.v", """
+        module top(input a, output y);
+            leaf u0(.a(a), .z(y));
+            leaf u1(a, y, a);
+            missing u2(.a(a));
+            BUFG u3(.I(a), .O());
+        endmodule
+    """)
+    problems, warnings, rechecked = preflight_check([leaf, top], tmp_path / "cache")
+    assert warnings == []
+    assert rechecked == [leaf, top]
+    assert problems == [
+        (top, 3, "module 'leaf' has no port 'z'"),
+        (top, 4, "instance 'u1' connects 3 ports, 'leaf' has 2"),
+        (top, 5, "instance 'u2' of undeclared module 'missing'"),
+    ]
+
+
+def test_warnings_are_returned_separately(tmp_path):
+    design = write(tmp_path, "d.v", """
+        module d;
+            wire x
+            wire y;
+        endmodule
+    """)
+    problems, warnings, _ = preflight_check([design], tmp_path / "cache")
+    assert problems == []
+    assert warnings == [(design, 3, "expected ';' after 'x'")]
+
+
+def test_duplicate_module_across_files(tmp_path):
+    a = write(tmp_path, "a.v", "module m; endmodule\n")
+    b = write(tmp_path, "b.v", "module m; endmodule\n")
+    problems, _, _ = preflight_check([a, b], tmp_path / "cache")
+    assert problems == [(b, 1, "module 'm' already defined in a.v")]
+
+
+def test_cache_keeps_files_from_other_calls(tmp_path):
+    design = write(tmp_path, "d.v", "module d; endmodule\n")
+    bench = write(tmp_path, "d_tb.v", "module d_tb; d uut(); endmodule\n")
+    cache = tmp_path / "cache"
+
+    assert preflight_check([design, bench], cache)[2] == [design, bench]
+    assert preflight_check([design], cache)[2] == []
+    assert preflight_check([design, bench], cache)[2] == []
+
+    design.write_text("module d(input x); endmodule\n")
+    assert preflight_check([design, bench], cache)[2] == [design]
+
+    bench.unlink()
+    preflight_check([design], cache)
+    assert list(json.loads((cache / "preflight.json").read_text())["files"]) == [str(design)]
+
+
+def fake_xvlog(tmp_path, output, code):
+    xvlog = tmp_path / "xvlog"
+    xvlog.write_text(f"#!{sys.executable}\nimport sys\nprint({output!r})\nsys.exit({code})\n")
+    xvlog.chmod(0o755)
+    return str(xvlog)
+
+
+def test_xvlog_errors_are_cached(tmp_path):
+    design = write(tmp_path, "d.v", "module d; endmodule\n")
+    xvlog = fake_xvlog(tmp_path, f"ERROR: [VRFC 10-2989] 'x' is not declared [{design}:1]", 1)
+    problems, _, _ = preflight_check([design], tmp_path / "cache", xvlog)
+    assert problems == [(design, 1, "xvlog: 'x' is not declared")]
+    cache = json.loads((tmp_path / "cache" / "preflight.json").read_text())
+    assert cache["files"][str(design)]["xvlog"] == [[1, "xvlog: 'x' is not declared"]]
+
+
+def test_failed_xvlog_run_is_reported_not_cached(tmp_path):
+    design = write(tmp_path, "d.v", "module d; endmodule\n")
+    xvlog = fake_xvlog(tmp_path, "ERROR: [Common 17-345] A valid license was not found", 1)
+    problems, _, _ = preflight_check([design], tmp_path / "cache", xvlog)
+    assert problems == [(None, None, "xvlog: [Common 17-345] A valid license was not found")]
+    cache = json.loads((tmp_path / "cache" / "preflight.json").read_text())
+    assert "xvlog" not in cache["files"][str(design)]
+
+
+# ─────────────────────────────────────────────────────────────
+# The sources in this repo
+# ─────────────────────────────────────────────────────────────
+# Known-bad sources: Lab5 is broken, and the Lab3T2/Lab3T3 testbenches list
+# a port 'sw' without declaring its direction
+KNOWN_BAD = {"Lab5", "Lab3T2/7SegBin_tb.v", "Lab3T3/7SegOne_tb.v"}
+
+
+def test_repo_sources_scan_clean(repo_root):
+    checked = 0
+    for vfile in sorted(repo_root.glob("*/*.v")):
+        rel = vfile.relative_to(repo_root).as_posix()
+        if rel in KNOWN_BAD or rel.split("/")[0] in KNOWN_BAD:
+            continue
+        assert errors(vfile.read_text(errors="replace")) == [], rel
+        checked += 1
+    assert checked > 40
@@ -0,0 +1,108 @@
+"""Report parsers in run_hardware.py, against the .rpt files checked into the repo"""
+import pytest
+
+from run_hardware import (_to_float, collect_reports, parse_power, parse_timing_summary,
+                          parse_utilization, record_build)
+
+
+def impl_dir(repo_root, folder):
+    return next((repo_root / folder / "vivado_project").glob("*.runs/impl_1"))
+
+
+# Summary table of HW3T6_2's routed power report
+OVERHEATED_POWER = """\
+1. Summary
+----------
+
++--------------------------+----------------------------------+
+| Total On-Chip Power (W)  | 21.092 (Junction temp exceeded!) |
+| Design Power Budget (W)  | Unspecified*                     |
+| Power Budget Margin (W)  | NA                               |
+| Dynamic (W)              | 20.606                           |
+| Device Static (W)        | 0.486                            |
+| Effective TJA (C/W)      | 5.0                              |
+| Max Ambient (C)          | 0.0                              |
+| Junction Temperature (C) | 125.0                            |
+| Confidence Level         | Low                              |
++--------------------------+----------------------------------+
+"""
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("0.072", 0.072),
+    ("-1.250", -1.25),
+    ("12", 12.0),
+    ("21.092 (Junction temp exceeded!)", 21.092),
+    ("inf", None),
+    ("NA", None),
+    ("Unspecified*", None),
+    ("", None),
+    (None, None),
+])
+def test_to_float_reads_leading_number(cell, expected):
+    assert _to_float(cell) == expected
+
+
+def test_power_with_annotated_total(tmp_path):
+    rpt = tmp_path / "carpark_top_power_routed.rpt"
+    rpt.write_text(OVERHEATED_POWER)
+    assert parse_power(rpt) == {"total_w": 21.092, "dynamic_w": 20.606,
+                                "static_w": 0.486, "junction_c": 125.0}
+
+
+def test_power_report_in_repo(repo_root):
+    rpt = repo_root / "HW3T6_2/vivado_project/HW3T6_2.runs/impl_1/carpark_top_power_routed.rpt"
+    assert parse_power(rpt)["total_w"] == 21.092
+
+
+# ─────────────────────────────────────────────────────────────
+# Reports checked into the repo
+# ─────────────────────────────────────────────────────────────
+@pytest.mark.parametrize("folder, top, timing", [
+    ("Lab4T5", "trafficLight_top", {"wns": 4.333, "tns": 0.0, "whs": 0.242, "ths": 0.0,
+                                    "clock": "sys_clk_pin", "period_ns": 10.0, "fmax_mhz": 176.46}),
+    ("Lab5T1", "adder_top", {"wns": 7.302, "tns": 0.0, "whs": 0.295, "ths": 0.0,
+                             "clock": "sys_clk_pin", "period_ns": 10.0, "fmax_mhz": 370.645}),
+    # clock defined but no timed paths: every slack is NA
+    ("Quiz1", "quiz_top", {"wns": None, "tns": None, "whs": None, "ths": None,
+                           "clock": "sys_clk_pin", "period_ns": 10.0, "fmax_mhz": None}),
+    # purely combinational, no clock at all
+    ("HW3T6", "home_alarm_top", {"wns": None, "tns": None, "whs": None, "ths": None,
+                                 "clock": None, "period_ns": None, "fmax_mhz": None}),
+])
+def test_timing_summary(repo_root, folder, top, timing):
+    rpt = impl_dir(repo_root, folder) / f"{top}_timing_summary_routed.rpt"
+    assert parse_timing_summary(rpt) == timing
+
+
+@pytest.mark.parametrize("folder, top, utilization", [
+    ("Lab4T5", "trafficLight_top", {"lut": 57.0, "ff": 43.0, "bram": 0.0, "dsp": 0.0}),
+    ("Lab5T3", "adder_top", {"lut": 37.0, "ff": 75.0, "bram": 0.0, "dsp": 0.0}),
+    ("HW3T6_2", "carpark_top", {"lut": 14.0, "ff": 0.0, "bram": 0.0, "dsp": 0.0}),
+])
+def test_utilization(repo_root, folder, top, utilization):
+    rpt = impl_dir(repo_root, folder) / f"{top}_utilization_placed.rpt"
+    assert parse_utilization(rpt) == utilization
+
+
+def test_collect_reports(repo_root):
+    summary, files = collect_reports(impl_dir(repo_root, "Lab4T5"), "trafficLight_top")
+    assert summary["power"] == {"total_w": 0.073, "dynamic_w": 0.001,
+                                "static_w": 0.072, "junction_c": 25.4}
+    assert summary["timing"]["fmax_mhz"] == 176.46
+    assert sorted(files) == ["power_report", "timing_report", "utilization_report"]
+
+
+def test_collect_reports_without_reports(tmp_path):
+    summary, files = collect_reports(tmp_path, "top")
+    assert summary == {"timing": None, "utilization": None, "power": None}
+    assert files == {}
+
+
+def test_record_build_returns_previous_different_build(tmp_path):
+    first = {"power": {"total_w": 1.0}}
+    second = {"power": {"total_w": 2.0}}
+    assert record_build(tmp_path, "a", first) is None
+    assert record_build(tmp_path, "a", first) is None        # same sources again
+    assert record_build(tmp_path, "b", second)["power"] == first["power"]
+    assert record_build(tmp_path, "a", first)["power"] == second["power"]
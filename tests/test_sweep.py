@@ -0,0 +1,133 @@
+"""Parameter/define sweeps in run_simulation.py, run against the fake Vivado"""
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench import make_fake_toolchain
+from run_simulation import check_sweep_names, classify_sweep_names, parse_sweep_arg, simulate
+
+COUNTER = """\
+module counter #(parameter N = 4) (input clk, input rst, output reg [N-1:0] count);
+    always @(posedge clk) count <= rst ? 0 : count + 1;
+endmodule
+"""
+
+COUNTER_TB = """\
+`timescale 1ns / 1ps
+`ifndef STEP
+`define STEP 5
+`endif
+module counter_tb;
+    parameter N = 4;
+    localparam HALF = 5;
+    reg clk = 0, rst = 1;
+    wire [N-1:0] count;
+    counter #(.N(N)) UUT(.clk(clk), .rst(rst), .count(count));
+    always #`STEP clk = ~clk;
+`ifdef SLOW
+    initial #100 rst = 0;
+`else
+    initial #10 rst = 0;
+`endif
+endmodule
+"""
+
+
+@pytest.fixture
+def counter(tmp_path):
+    source = tmp_path / "counter"
+    source.mkdir()
+    (source / "counter.v").write_text(COUNTER)
+    (source / "counter_tb.v").write_text(COUNTER_TB)
+    return source
+
+
+@pytest.fixture
+def fake_vivado(tmp_path):
+    return make_fake_toolchain(tmp_path / "bin")
+
+
+def check(counter, sweeps):
+    files = [counter / "counter.v", counter / "counter_tb.v"]
+    return check_sweep_names(sweeps, files, files[1], "counter_tb")
+
+
+@pytest.mark.parametrize("arg, expected", [
+    ("N=2,4,8", ("N", ["2", "4", "8"])),
+    (" N = 2 , 4 ", ("N", ["2", "4"])),
+    ("SLOW=-,1", ("SLOW", ["-", "1"])),
+    ("N=", None),
+    ("N", None),
+    ("=2,4", None),
+    ("2N=1", None),
+])
+def test_parse_sweep_arg(arg, expected):
+    assert parse_sweep_arg(arg) == expected
+
+
+def test_classify_sweep_names(counter):
+    files = [counter / "counter.v", counter / "counter_tb.v"]
+    assert classify_sweep_names(["N", "STEP", "SLOW", "WIDTH"], files) == (["STEP", "SLOW"], ["N", "WIDTH"])
+
+
+def test_check_accepts_parameters_and_defines(counter):
+    assert check(counter, [("N", ["2", "4"]), ("STEP", ["5", "10"]), ("SLOW", ["-", "1"])]) == ([], [])
+
+
+def test_check_rejects_unknown_names_and_localparams(counter):
+    errors, _ = check(counter, [("WIDTH", ["2"]), ("HALF", ["2"])])
+    assert [msg for msg, _, _ in errors] == [
+        "'WIDTH' is neither a parameter of counter_tb nor a `define used in the sources",
+        "'HALF' is a localparam of counter_tb and cannot be overridden",
+    ]
+
+
+def test_check_rejects_undefined_value_for_a_parameter(counter):
+    errors, _ = check(counter, [("N", ["-", "4"])])
+    assert [msg for msg, _, _ in errors] == ["'N' is a parameter; '-' only leaves a `define unset"]
+
+
+def test_check_warns_when_every_value_defines_an_ifdef_name(counter):
+    _, warnings = check(counter, [("SLOW", ["0", "1"])])
+    assert [msg for msg, _, _ in warnings] == [
+        "`SLOW is only tested with `ifdef, so every value defines it; use SLOW=-,1 for a run without it"]
+
+
+def test_check_warns_about_unguarded_define(counter):
+    tb = counter / "counter_tb.v"
+    tb.write_text(COUNTER_TB.replace("`ifndef STEP\n`define STEP 5\n`endif\n", "`define STEP 5\n"))
+    _, warnings = check(counter, [("STEP", ["5", "10"])])
+    assert warnings == [("`define STEP is set unconditionally and overrides the sweep value", tb, 2)]
+
+
+def test_sweep_runs_every_combination(counter, fake_vivado):
+    result = simulate(counter, vivado_path=fake_vivado, sweep=[("N", ["2", "4"]), ("SLOW", ["-", "1"])],
+                      jobs=2)
+    assert result.success, result.errors
+    assert result.mode == "sweep"
+    assert [row["label"] for row in result.sweep] == ["N=2 SLOW=-", "N=2 SLOW=1", "N=4 SLOW=-", "N=4 SLOW=1"]
+    assert all(row["passed"] for row in result.sweep)
+
+    # one library per define set; '-' compiles without -d
+    sweep_dir = result.artifacts["sweep"]
+    logs = [log.read_text() for log in sorted(sweep_dir.glob("lib_*/compile.log"))]
+    assert len(logs) == 2
+    assert "-d SLOW" not in logs[0] and "-d SLOW=1" in logs[1]
+
+
+def test_sweep_stops_on_unknown_name(counter, fake_vivado):
+    result = simulate(counter, vivado_path=fake_vivado, sweep=[("WIDTH", ["2", "4"])])
+    assert not result.success
+    assert [d.stage for d in result.errors] == ["sweep"]
+    assert not (counter / "vivado_project" / "sweep").exists()
+
+
+@pytest.mark.parametrize("jobs", ["abc", "-1", "0"])
+def test_bad_jobs_value(counter, repo_root, jobs):
+    proc = subprocess.run([sys.executable, str(repo_root / "run_simulation.py"), str(counter),
+                           "--jobs", jobs], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          universal_newlines=True)
+    assert proc.returncode == 1
+    assert f"Bad --jobs value '{jobs}'" in proc.stdout
+    assert "Traceback" not in proc.stdout
@@ -0,0 +1,43 @@
+"""timed_stage: stage timings cover the block, not the progress indicator"""
+import time
+
+import pytest
+
+from vivado_common import FlowResult, QuietReporter, timed_stage
+
+
+class SlowStage:
+    """Like a spinner that takes a while to start and stop"""
+    def __init__(self, message):
+        self.message = message
+
+    def __enter__(self):
+        time.sleep(0.1)
+        return self
+
+    def __exit__(self, *_):
+        time.sleep(0.1)
+
+
+class SlowReporter(QuietReporter):
+    def stage(self, message, long_running=False):
+        time.sleep(0.1)
+        return SlowStage(message)
+
+
+def test_indicator_is_not_timed(tmp_path):
+    result = FlowResult(tmp_path, "basys3")
+    with timed_stage(result, "tcl", SlowReporter(), "Writing Tcl"):
+        pass
+    assert result.timings["tcl"] < 0.05
+
+
+def test_failed_block_is_timed_and_accumulates(tmp_path):
+    result = FlowResult(tmp_path, "basys3")
+    with timed_stage(result, "preflight"):
+        time.sleep(0.02)
+    with pytest.raises(RuntimeError):
+        with timed_stage(result, "preflight"):
+            time.sleep(0.02)
+            raise RuntimeError
+    assert result.timings["preflight"] >= 0.04
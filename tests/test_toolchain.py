@@ -0,0 +1,108 @@
+"""Vivado discovery (resolve_toolchain) against fake install trees"""
+import pytest
+
+import vivado_common
+from run_hardware import build_hardware
+from run_simulation import simulate
+from vivado_common import TOOLCHAIN_TOOLS, resolve_toolchain
+
+
+@pytest.fixture
+def installs(tmp_path, monkeypatch):
+    """A fake install root; returns a function that adds a version to it"""
+    root = tmp_path / "Xilinx" / "Vivado"
+    root.mkdir(parents=True)
+    monkeypatch.setitem(vivado_common.VIVADO_INSTALL_GLOBS, "posix", (str(root / "*" / "bin"),))
+    monkeypatch.setattr(vivado_common.sys, "platform", "linux")
+    for var in ("VIVADO_PATH", "XILINX_VIVADO", "VIVADO_VERSION"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+
+    def install(version):
+        bin_dir = root / version / "bin"
+        bin_dir.mkdir(parents=True)
+        for tool in TOOLCHAIN_TOOLS:
+            (bin_dir / tool).write_text("#!/bin/sh\n")
+            (bin_dir / tool).chmod(0o755)
+        return bin_dir
+    return install
+
+
+def test_newest_install_is_used(installs, tmp_path):
+    installs("2018.3")
+    bin_dir = installs("2023.2")
+    toolchain = resolve_toolchain(cache_dir=tmp_path / "cache")
+    assert toolchain.version == "2023.2"
+    assert toolchain.source == "install root"
+    assert toolchain.tool("xsim") == str(bin_dir / "xsim")
+    assert toolchain.tool("hw_server") == str(bin_dir / "hw_server")
+
+
+def test_version_setting_pins_an_install(installs, tmp_path, monkeypatch):
+    installs("2018.3")
+    installs("2023.2")
+    assert resolve_toolchain(version="2018", cache_dir=tmp_path / "cache").version == "2018.3"
+    monkeypatch.setenv("VIVADO_VERSION", "2018.3")
+    assert resolve_toolchain(cache_dir=tmp_path / "cache").version == "2018.3"
+    assert resolve_toolchain(version="2020.1", cache_dir=tmp_path / "cache") is None
+
+
+def test_cache_is_reused(installs, tmp_path):
+    installs("2018.3")
+    assert not resolve_toolchain(cache_dir=tmp_path / "cache").cached
+    assert resolve_toolchain(cache_dir=tmp_path / "cache").cached
+
+
+def test_new_install_invalidates_cache(installs, tmp_path):
+    installs("2018.3")
+    resolve_toolchain(cache_dir=tmp_path / "cache")
+    installs("2023.2")
+    toolchain = resolve_toolchain(cache_dir=tmp_path / "cache")
+    assert (toolchain.version, toolchain.cached) == ("2023.2", False)
+
+
+def test_removed_tool_invalidates_cache(installs, tmp_path):
+    bin_dir = installs("2018.3")
+    resolve_toolchain(cache_dir=tmp_path / "cache")
+    (bin_dir / "xsim").unlink()
+    toolchain = resolve_toolchain(cache_dir=tmp_path / "cache")
+    assert not toolchain.cached
+    assert toolchain.tool("xsim") is None
+
+
+def test_vivado_path_env_outranks_install_roots(installs, tmp_path, monkeypatch):
+    installs("2023.2")
+    monkeypatch.setenv("VIVADO_PATH", str(installs("2018.3").parent))
+    toolchain = resolve_toolchain(cache_dir=tmp_path / "cache")
+    assert (toolchain.version, toolchain.source) == ("2018.3", "VIVADO_PATH")
+
+
+def test_explicit_path(installs, tmp_path):
+    bin_dir = installs("2018.3")
+    assert resolve_toolchain(str(bin_dir)).vivado == str(bin_dir / "vivado")
+    assert resolve_toolchain(str(tmp_path / "nowhere" / "vivado")) is None
+
+
+def test_flows_pass_the_cache_dir_through(installs, tmp_path, monkeypatch):
+    monkeypatch.setenv("VIVADO_PATH", str(installs("2018.3").parent))
+    for flow in (simulate, build_hardware):
+        cache_dir = tmp_path / flow.__name__
+        result = flow(tmp_path / "empty", toolchain_cache_dir=cache_dir)
+        assert result.toolchain.version == "2018.3"
+        assert (cache_dir / "toolchain.json").exists()
+
+
+def test_explicit_path_honours_the_version(installs, tmp_path, monkeypatch):
+    root = installs("2018.3").parent.parent
+    installs("2023.2")
+    assert resolve_toolchain(str(root)).version == "2023.2"
+    assert resolve_toolchain(str(root), version="2018").version == "2018.3"
+    assert resolve_toolchain(str(root / "2023.2" / "bin"), version="2018.3") is None
+    monkeypatch.setenv("VIVADO_VERSION", "2018.3")
+    assert resolve_toolchain(str(root)).version == "2018.3"
+
+
+def test_explicit_path_with_the_wrong_version_is_reported(installs, tmp_path):
+    bin_dir = installs("2023.2")
+    result = simulate(tmp_path / "empty", vivado_path=str(bin_dir), vivado_version="2018.3")
+    assert [d.message for d in result.errors] == [f"Vivado 2018.3 executable not found in {bin_dir}!"]
@@ -0,0 +1,1151 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for run_simulation.py and run_hardware.py
+Result objects, pre-flight checks, constraint pruning and Vivado discovery
+"""
+
+import subprocess
+import sys
+import os
+from pathlib import Path
+import shutil
+import time
+import re
+import json
+import hashlib
+import tempfile
+import contextlib
+import fnmatch
+import glob
+import platform
+
+# ─────────────────────────────────────────────────────────────
+# Results and reporting
+# ─────────────────────────────────────────────────────────────
+class Diagnostic:
+    """One problem found by a flow.
+    stage     str   -- 'setup', 'preflight', 'constraints', 'vivado', ...
+    message   str
+    severity  str   -- 'error' or 'warning'
+    file      Path or None, line int or None (set for source diagnostics)
+    hint      str or None -- extra advice shown under the message
+    """
+    def __init__(self, stage, message, severity="error", file=None, line=None, hint=None):
+        self.stage = stage
+        self.message = message
+        self.severity = severity
+        self.file = file
+        self.line = line
+        self.hint = hint
+
+    @property
+    def location(self):
+        if self.file is None:
+            return ""
+        return f"{Path(self.file).name}:{self.line}" if self.line else Path(self.file).name
+
+    def __repr__(self):
+        where = f"{self.location}: " if self.file else ""
+        return f"<Diagnostic {self.severity} [{self.stage}] {where}{self.message}>"
+
+
+class FlowResult:
+    """Everything a flow resolved, produced and measured.
+    success        bool
+    source_dir     Path
+    project_name   str, project_dir Path, board str
+    design_files   [Path], design_top str or None
+    constraint_file Path or None  -- the master XDC that was found
+    timings        {stage: seconds}
+    diagnostics    [Diagnostic]
+    artifacts      {name: Path}   -- 'tcl', 'xdc', 'wdb', 'bit', ...
+    cache_hits     {name: int}    -- files/entries reused from .vivado_cache
+    output         str            -- captured Vivado batch output, if any
+    toolchain      Toolchain or None -- the Vivado install that was used
+    """
+    def __init__(self, source_dir, board):
+        self.success = False
+        self.source_dir = Path(source_dir).resolve()
+        self.project_name = self.source_dir.name
+        self.project_dir = self.source_dir / "vivado_project"
+        self.board = board
+        self.design_files = []
+        self.design_top = None
+        self.constraint_file = None
+        self.timings = {}
+        self.diagnostics = []
+        self.artifacts = {}
+        self.cache_hits = {}
+        self.output = ""
+        self.toolchain = None
+
+    @property
+    def errors(self):
+        return [d for d in self.diagnostics if d.severity == "error"]
+
+    @property
+    def warnings(self):
+        return [d for d in self.diagnostics if d.severity == "warning"]
+
+    @property
+    def total_seconds(self):
+        return sum(self.timings.values())
+
+    def add_error(self, stage, message, **kwargs):
+        self.diagnostics.append(Diagnostic(stage, message, "error", **kwargs))
+
+    def add_warning(self, stage, message, **kwargs):
+        self.diagnostics.append(Diagnostic(stage, message, "warning", **kwargs))
+
+    def __repr__(self):
+        return (f"<{type(self).__name__} {self.project_name} success={self.success} "
+                f"errors={len(self.errors)} {self.total_seconds:.2f}s>")
+
+
+class _QuietStage:
+    """Stage indicator with the Spinner interface that prints nothing"""
+    def __init__(self, message):
+        self.message = message
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+
+class QuietReporter:
+    """Reporter that prints nothing -- the default for API callers.
+    Subclass it (see TerminalReporter) to show progress or results."""
+    def plan(self, result):
+        """Called once inputs are resolved, before any work starts"""
+
+    def stage(self, message, long_running=False):
+        """Return a context manager with .message and .fail()"""
+        return _QuietStage(message)
+
+    def confirm(self, warning, question="Continue anyway?"):
+        """Ask whether to carry on despite a warning; quiet callers always decline"""
+        return False
+
+    def finish(self, result):
+        """Called once with the final result"""
+
+
+@contextlib.contextmanager
+def timed_stage(result, name, reporter=None, message=None, long_running=False):
+    """Time a block into result.timings[name], showing it via the reporter
+    when a message is given. Only the block is timed, not the indicator
+    (a spinner takes a while to stop)."""
+    indicator = reporter.stage(message, long_running) if message else _QuietStage(name)
+    with indicator:
+        start = time.perf_counter()
+        try:
+            yield indicator
+        finally:
+            result.timings[name] = result.timings.get(name, 0.0) + time.perf_counter() - start
+
+
+# ─────────────────────────────────────────────────────────────
+# Pre-flight checks
+# ─────────────────────────────────────────────────────────────
+CACHE_DIR_NAME = ".vivado_cache"   # per-source-dir cache, survives project cleanup
+PREFLIGHT_CACHE_VERSION = 2
+
+_VERILOG_KEYWORDS = {
+    "always", "and", "assign", "automatic", "begin", "buf", "bufif0", "bufif1",
+    "case", "casex", "casez", "cmos", "deassign", "default", "defparam",
+    "disable", "edge", "else", "end", "endcase", "endfunction", "endgenerate",
+    "endmodule", "endprimitive", "endspecify", "endtable", "endtask", "event",
+    "for", "force", "forever", "fork", "function", "generate", "genvar",
+    "highz0", "highz1", "if", "initial", "inout", "input", "integer", "join",
+    "localparam", "macromodule", "module", "nand", "negedge", "nmos", "nor",
+    "not", "notif0", "notif1", "or", "output", "parameter", "pmos", "posedge",
+    "primitive", "pull0", "pull1", "pulldown", "pullup", "rcmos", "real",
+    "realtime", "reg", "release", "repeat", "rnmos", "rpmos", "rtran",
+    "rtranif0", "rtranif1", "scalared", "signed", "specify", "strong0",
+    "strong1", "supply0", "supply1", "table", "task", "time", "tran",
+    "tranif0", "tranif1", "tri", "tri0", "tri1", "triand", "trior", "trireg",
+    "unsigned", "vectored", "wait", "wand", "weak0", "weak1", "while", "wire",
+    "wor", "xnor", "xor",
+}
+_DIRECTIONS = {"input", "output", "inout"}
+_BLOCK_PAIRS = {
+    "begin": "end", "case": "endcase", "casex": "endcase", "casez": "endcase",
+    "fork": "join", "function": "endfunction", "task": "endtask",
+    "generate": "endgenerate",
+}
+_BLOCK_CLOSERS = set(_BLOCK_PAIRS.values())
+
+_NOISE_RE = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|^[ \t]*`(?!define\b)\w+[^\n]*'
+                       r'|^[ \t]*`define(?:[^\n]*\\\n)*[^\n]*|\(\*(?!\s*\))[^;]*?\*\)', re.S | re.M)
+_CONDITIONAL_RE = re.compile(r'^[ \t]*`(ifdef|ifndef|elsif|else|endif)\b')
+_TOKEN_RE = re.compile(r"""
+    (?P<num>\d*\s*'[sS]?[bBoOdDhH]\s*[0-9a-fA-FxXzZ?_]+|\d[\d_]*(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<id>[A-Za-z_][\w$]*|\$[A-Za-z_][\w$]*|`[A-Za-z_]\w*|\\\S+)
+  | (?P<op><=|>=|==|!=|&&|\|\||<<|>>|\S)
+""", re.X)
+
+
+def _blank_noise(match):
+    """Blank out comments, attributes and directives (keeping line numbers);
+    strings become 0. Conditional directives are left for _first_branches."""
+    text = match.group(0)
+    if text.startswith('"'):
+        return '0'
+    if _CONDITIONAL_RE.match(text):
+        return text
+    return re.sub(r'[^\n]', ' ', text)
+
+
+def _first_branches(text):
+    """Keep only the first branch of each `ifdef/`ifndef, so alternative
+    module headers or declarations are not seen twice"""
+    lines = text.split('\n')
+    outer = []
+    active = True
+    for n, line in enumerate(lines):
+        m = _CONDITIONAL_RE.match(line)
+        if m:
+            if m.group(1) in ("ifdef", "ifndef"):
+                outer.append(active)
+            elif m.group(1) == "endif":
+                active = outer.pop() if outer else True
+            elif outer:
+                active = False
+        if m or not active:
+            lines[n] = ''
+    return '\n'.join(lines)
+
+
+def _tokenize(text):
+    """Split Verilog source into (kind, value, line) tokens"""
+    text = _first_branches(_NOISE_RE.sub(_blank_noise, text))
+    tokens = []
+    line = 1
+    pos = 0
+    for m in _TOKEN_RE.finditer(text):
+        line += text.count('\n', pos, m.start())
+        pos = m.start()
+        tokens.append((m.lastgroup, m.group(0), line))
+    return tokens
+
+
+def _is_operand(tok):
+    kind, value, _ = tok
+    if kind == "id":
+        return value not in _VERILOG_KEYWORDS
+    return kind in ("num", "str")
+
+
+def _skip_parens(tokens, i):
+    """tokens[i] is '('; return (index just past the matching ')', balanced)"""
+    depth = 0
+    while i < len(tokens):
+        kind, value, _ = tokens[i]
+        if value == '(':
+            depth += 1
+        elif value == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1, True
+        elif kind == "id" and value in ("module", "endmodule"):
+            return i, False
+        i += 1
+    return i, False
+
+
+def _skip_range(tokens, i):
+    """If tokens[i] is '[', return the index just past the matching ']'"""
+    if i >= len(tokens) or tokens[i][1] != '[':
+        return i
+    depth = 0
+    while i < len(tokens):
+        if tokens[i][1] == '[':
+            depth += 1
+        elif tokens[i][1] == ']':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _parse_port_list(tokens, start, end):
+    """Split a module header port list into (names, ansi)"""
+    names = []
+    ansi = False
+    chunk = []
+    depth = 0
+    for kind, value, _ in tokens[start:end] + [("op", ",", 0)]:
+        if value in ('[', '(', '{'):
+            depth += 1
+        elif value in (']', ')', '}'):
+            depth -= 1
+        elif value == ',' and depth == 0:
+            if any(v in _DIRECTIONS for _, v in chunk):
+                ansi = True
+            cut = next((n for n, (_, v) in enumerate(chunk) if v == '='), len(chunk))
+            idents = [v for k, v in chunk[:cut] if k == "id" and v not in _VERILOG_KEYWORDS]
+            if idents:
+                names.append(idents[-1])
+            chunk = []
+            continue
+        if depth == 0:
+            chunk.append((kind, value))
+    return names, ansi
+
+
+def _parse_connections(tokens, start, end):
+    """Return (named_ports, positional_count) of an instance connection list"""
+    named = []
+    positional = 0
+    depth = 0
+    seen_any = False
+    for n in range(start, end):
+        value = tokens[n][1]
+        if value in ('(', '[', '{'):
+            depth += 1
+        elif value in (')', ']', '}'):
+            depth -= 1
+        elif depth == 0 and value == '.' and n + 1 < end and tokens[n + 1][0] == "id":
+            named.append(tokens[n + 1][1])
+        elif depth == 0 and value == ',':
+            positional += 1
+        if depth == 0 and value != ',':
+            seen_any = True
+    if named:
+        return named, 0
+    return named, (positional + 1) if seen_any else 0
+
+
+def scan_verilog_source(text):
+    """Lightweight structural scan of Verilog source text.
+    Checks module/endmodule and block balance, header port lists and
+    likely missing semicolons. Returns a JSON-serialisable dict with the
+    modules defined, the instances made, [line, message] errors and
+    warnings (the missing-semicolon guess is only a warning)."""
+    tokens = _tokenize(text)
+    modules = {}
+    instances = []
+    errors = []
+    warnings = []
+    current = None
+    blocks = []
+    parens = []
+    declared = set()
+    stmt_start = False
+    prev = None
+    outside_reported = False
+    i = 0
+
+    while i < len(tokens):
+        kind, value, line = tokens[i]
+
+        # ── module header ────────────────────────────────────
+        if kind == "id" and value in ("module", "macromodule"):
+            if current:
+                errors.append([current["line"], f"module '{current['name']}' is missing endmodule"])
+            blocks, parens, declared = [], [], set()
+            i += 1
+            if i >= len(tokens) or tokens[i][0] != "id":
+                errors.append([line, "expected module name after 'module'"])
+                current = None
+                continue
+            current = {"name": tokens[i][1], "line": tokens[i][2], "ports": [], "ansi": True}
+            i += 1
+            if i < len(tokens) and tokens[i][1] == '#':
+                i += 1
+                if i < len(tokens) and tokens[i][1] == '(':
+                    i, _ = _skip_parens(tokens, i)
+            if i < len(tokens) and tokens[i][1] == '(':
+                close, balanced = _skip_parens(tokens, i)
+                if not balanced:
+                    errors.append([tokens[i][2], f"unbalanced '(' in port list of '{current['name']}'"])
+                current["ports"], current["ansi"] = _parse_port_list(tokens, i + 1, close - balanced)
+                i = close
+            if i >= len(tokens) or tokens[i][1] != ';':
+                errors.append([tokens[i - 1][2], f"expected ';' after module '{current['name']}' header"])
+            else:
+                i += 1
+            if current["name"] in modules:
+                errors.append([current["line"], f"module '{current['name']}' defined twice"])
+            stmt_start = True
+            prev = None
+            continue
+
+        if kind == "id" and value == "endmodule":
+            if not current:
+                errors.append([line, "endmodule without matching module"])
+            else:
+                for opener, open_line in blocks:
+                    errors.append([open_line, f"'{opener}' is never closed before endmodule"])
+                for open_line in parens:
+                    errors.append([open_line, "unbalanced '('"])
+                if not current["ansi"]:
+                    for port in current["ports"]:
+                        if port not in declared:
+                            errors.append([current["line"], f"port '{port}' has no input/output declaration"])
+                modules[current["name"]] = {"line": current["line"], "ports": current["ports"]}
+                current = None
+            i += 1
+            continue
+
+        if not current:
+            if not outside_reported:
+                errors.append([line, f"unexpected '{value}' outside module"])
+                outside_reported = True
+            i += 1
+            continue
+        outside_reported = False
+
+        # ── delimiters ───────────────────────────────────────
+        if value in ('(', '[', '{'):
+            parens.append(line)
+        elif value in (')', ']', '}'):
+            if parens:
+                parens.pop()
+            else:
+                errors.append([line, f"unmatched '{value}'"])
+        depth = len(parens)
+
+        # ── block balance ────────────────────────────────────
+        if kind == "id" and value in _BLOCK_PAIRS:
+            blocks.append((value, line))
+            if value in ("begin", "fork") and i + 2 < len(tokens) and tokens[i + 1][1] == ':':
+                i += 3
+                stmt_start = True
+                prev = None
+                continue
+        elif kind == "id" and value in _BLOCK_CLOSERS:
+            if not blocks:
+                errors.append([line, f"'{value}' without matching opener"])
+            elif _BLOCK_PAIRS[blocks[-1][0]] != value:
+                opener, open_line = blocks.pop()
+                errors.append([line, f"'{value}' closes '{opener}' opened at line {open_line}"])
+            else:
+                blocks.pop()
+
+        # ── declarations (non-ANSI port check) ───────────────
+        if kind == "id" and value in _DIRECTIONS and depth == 0 and not current["ansi"]:
+            j = i + 1
+            while j < len(tokens) and tokens[j][1] != ';':
+                if tokens[j][0] == "id" and tokens[j][1] not in _VERILOG_KEYWORDS:
+                    declared.add(tokens[j][1])
+                j += 1
+
+        # ── instantiation: <module> [#(...)] <name> [range] ( ... ) ; ─
+        if stmt_start and depth == 0 and _is_operand(tokens[i]) and kind == "id" \
+                and not value.startswith(('$', '`')):
+            j = i + 1
+            if j < len(tokens) and tokens[j][1] == '#':
+                j += 1
+                if j < len(tokens) and tokens[j][1] == '(':
+                    j, _ = _skip_parens(tokens, j)
+            k = _skip_range(tokens, j + 1)
+            if j < len(tokens) and tokens[j][0] == "id" and k < len(tokens) and tokens[k][1] == '(':
+                while True:
+                    inst_name, inst_line = tokens[j][1], tokens[j][2]
+                    close, balanced = _skip_parens(tokens, k)
+                    named, positional = _parse_connections(tokens, k + 1, close - balanced)
+                    instances.append({"module": value, "name": inst_name, "line": inst_line,
+                                      "ports": named, "positional": positional})
+                    if close + 1 < len(tokens) and tokens[close][1] == ',' \
+                            and tokens[close + 1][0] == "id":
+                        k = _skip_range(tokens, close + 2)
+                        if k < len(tokens) and tokens[k][1] == '(':
+                            j = close + 1
+                            continue
+                    break
+                if close >= len(tokens) or tokens[close][1] != ';':
+                    errors.append([tokens[close - 1][2], f"expected ';' after instance '{inst_name}'"])
+                    i = close
+                else:
+                    i = close + 1
+                stmt_start = True
+                prev = None
+                continue
+
+        # ── missing ';' heuristic: two operands back to back ─
+        if depth == 0 and prev is not None and _is_operand(prev) and not stmt_start:
+            if _is_operand(tokens[i]) or (kind == "id" and value in _VERILOG_KEYWORDS
+                                          and value not in ("or", "begin")):
+                warnings.append([prev[2], f"expected ';' after '{prev[1]}'"])
+
+        # a '#<delay>' is not an operand for the heuristic above
+        if kind == "num" and prev is not None and prev[1] == '#':
+            prev = ("op", "#", line)
+        else:
+            prev = tokens[i]
+        stmt_start = depth == 0 and (value == ';' or value in _BLOCK_PAIRS
+                                     or value in _BLOCK_CLOSERS)
+        i += 1
+
+    if current:
+        errors.append([current["line"], f"module '{current['name']}' is missing endmodule"])
+    return {"modules": modules, "instances": instances, "errors": errors, "warnings": warnings}
+
+
+def file_hash(path):
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def load_json_cache(cache_file, version):
+    """Load a JSON cache file, returning {} if it is missing, corrupt or stale"""
+    try:
+        with open(cache_file, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != version:
+        return {}
+    return data
+
+
+def save_json_cache(cache_file, data):
+    """Write a JSON cache file atomically; a failed write only costs a rescan"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
+def find_vivado_tool(vivado_path, tool):
+    """Locate a companion tool (xvlog, xelab, xsim) next to the Vivado
+    executable, or on the PATH"""
+    vivado = Path(vivado_path)
+    if vivado.parent != Path("."):
+        candidate = vivado.with_name(tool + ".bat" if vivado.suffix == ".bat" else tool)
+        if candidate.exists():
+            return str(candidate)
+    return shutil.which(tool)
+
+
+_XVLOG_ERROR_RE = re.compile(r'^ERROR:\s*(?:\[[^\]]+\]\s*)?(.*?)\s*\[(.+):(\d+)\]\s*$')
+
+
+def run_xvlog(vfiles, xvlog_path):
+    """Compile files with a standalone xvlog in a scratch directory.
+    Returns (results, failure): results is {resolved_path: [[line, message], ...]}
+    for every file given; failure is None, or the messages of a run that
+    exited non-zero without a file:line error (license, missing library, ...)."""
+    results = {str(v): [] for v in vfiles}
+    with tempfile.TemporaryDirectory() as scratch:
+        proc = subprocess.run(
+            [xvlog_path, "--nolog"] + [str(v) for v in vfiles],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            universal_newlines=True, cwd=scratch
+        )
+    found = False
+    for out_line in proc.stdout.splitlines():
+        m = _XVLOG_ERROR_RE.match(out_line.strip())
+        if not m:
+            continue
+        path = str(Path(m.group(2)).resolve())
+        results.setdefault(path, []).append([int(m.group(3)), f"xvlog: {m.group(1)}"])
+        found = True
+    if proc.returncode == 0 or found:
+        return results, None
+    failure = ["xvlog: " + l.split("ERROR:", 1)[1].strip() for l in proc.stdout.splitlines()
+               if l.strip().startswith("ERROR:")]
+    return results, failure or [f"xvlog: exited with code {proc.returncode}"]
+
+
+def preflight_check(verilog_files, cache_dir, xvlog_path=None):
+    """Scan Verilog files for structural errors before starting Vivado.
+    Per-file scans (and optional xvlog results) are cached by content hash,
+    so only changed files are re-checked. Cross-file checks -- undeclared
+    modules and port names on instances -- are cheap and always re-run.
+    Returns (problems, warnings, rechecked) where problems and warnings are
+    (file, line, message); file and line are None when xvlog itself failed
+    to run. Only problems should stop a flow."""
+    cache_file = Path(cache_dir) / "preflight.json"
+    cache = load_json_cache(cache_file, PREFLIGHT_CACHE_VERSION)
+    entries = cache.get("files", {})
+
+    scans = {}
+    changed = []
+    for vfile in verilog_files:
+        key = str(vfile)
+        digest = file_hash(vfile)
+        entry = entries.get(key)
+        if not entry or entry.get("hash") != digest:
+            with open(vfile, 'r', errors='replace') as f:
+                entry = {"hash": digest, "scan": scan_verilog_source(f.read())}
+            entries[key] = entry
+            changed.append(vfile)
+        scans[vfile] = entry
+
+    xvlog_failure = []
+    if xvlog_path:
+        pending = [v for v in verilog_files if "xvlog" not in scans[v]]
+        if pending:
+            results, failure = run_xvlog(pending, xvlog_path)
+            if failure:
+                # A failed run says nothing about the files; don't cache it
+                xvlog_failure = failure
+            else:
+                for vfile in pending:
+                    scans[vfile]["xvlog"] = results.get(str(vfile), [])
+
+    # Keep entries for files this call did not ask about (the hardware flow
+    # skips testbenches); only forget files that no longer exist
+    cache["version"] = PREFLIGHT_CACHE_VERSION
+    cache["files"] = {k: v for k, v in entries.items() if os.path.exists(k)}
+    save_json_cache(cache_file, cache)
+
+    # ── per-file diagnostics ─────────────────────────────────
+    diagnostics = []
+    warnings = []
+    for vfile in verilog_files:
+        entry = scans[vfile]
+        for line, msg in entry["scan"]["errors"] + entry.get("xvlog", []):
+            diagnostics.append((vfile, line, msg))
+        for line, msg in entry["scan"]["warnings"]:
+            warnings.append((vfile, line, msg))
+
+    # ── cross-file checks ────────────────────────────────────
+    defined = {}
+    for vfile in verilog_files:
+        for name, info in scans[vfile]["scan"]["modules"].items():
+            if name in defined:
+                diagnostics.append((vfile, info["line"],
+                                    f"module '{name}' already defined in {defined[name][0].name}"))
+            else:
+                defined[name] = (vfile, info)
+
+    for vfile in verilog_files:
+        for inst in scans[vfile]["scan"]["instances"]:
+            target = defined.get(inst["module"])
+            if target is None:
+                # ALL-CAPS names are treated as vendor primitives (BUFG, IBUF, ...)
+                if not re.match(r'^[A-Z][A-Z0-9_]*$', inst["module"]):
+                    diagnostics.append((vfile, inst["line"],
+                                        f"instance '{inst['name']}' of undeclared module '{inst['module']}'"))
+                continue
+            ports = target[1]["ports"]
+            for port in inst["ports"]:
+                if port not in ports:
+                    diagnostics.append((vfile, inst["line"],
+                                        f"module '{inst['module']}' has no port '{port}'"))
+            if inst["positional"] > len(ports):
+                diagnostics.append((vfile, inst["line"],
+                                    f"instance '{inst['name']}' connects {inst['positional']} ports, "
+                                    f"'{inst['module']}' has {len(ports)}"))
+
+    diagnostics.sort(key=lambda d: (str(d[0]), d[1]))
+    diagnostics += [(None, None, msg) for msg in xvlog_failure]
+    return diagnostics, warnings, changed
+
+
+# ─────────────────────────────────────────────────────────────
+# Constraint helpers
+# ─────────────────────────────────────────────────────────────
+XDC_CACHE_VERSION = 1
+
+_GET_PORTS_RE = re.compile(r'\[\s*get_ports\s+(\{[^}]*\}|[^\]\s]+)\s*\]')
+_PORT_REF_RE = re.compile(r'^([A-Za-z_][\w$*?]*)(?:\[(\d+|\*)\])?$')
+_PIN_PROPS = ("PACKAGE_PIN", "IOSTANDARD")
+
+
+def parse_xdc(xdc_file):
+    """Parse an XDC file into a list of commands.
+    Each command records its text, the port references it applies to
+    ([name, bit] with bit None for whole ports / '*' for all bits), the
+    pin properties it sets and whether it was commented out. Commented
+    commands are kept because master XDCs ship unused pins that way."""
+    commands = []
+    pending = ""
+    with open(xdc_file, 'r', errors='replace') as f:
+        lines = f.read().splitlines()
+    for line_no, raw in enumerate(lines, 1):
+        text = pending + raw.strip()
+        if text.endswith("\\"):
+            pending = text[:-1] + " "
+            continue
+        pending = ""
+        commented = text.startswith("#")
+        if commented:
+            text = text.lstrip("#").strip()
+            if not text.startswith(("set_property", "create_clock")) or "get_ports" not in text:
+                continue
+        if not text:
+            continue
+
+        ports = []
+        for target in _GET_PORTS_RE.findall(text):
+            for ref in target.strip("{}").split():
+                m = _PORT_REF_RE.match(ref)
+                if m:
+                    bit = m.group(2)
+                    ports.append([m.group(1), int(bit) if bit and bit != "*" else bit])
+        props = [p for p in _PIN_PROPS if re.search(rf'\b{p}\b', text)]
+        if text.startswith("create_clock"):
+            props.append("CLOCK")
+        commands.append({"line": line_no, "text": text, "ports": ports,
+                         "props": props, "commented": commented})
+    return commands
+
+
+def load_xdc(xdc_file, cache_dir):
+    """parse_xdc() with a per-content-hash cache in cache_dir"""
+    cache_file = Path(cache_dir) / "xdc.json"
+    cache = load_json_cache(cache_file, XDC_CACHE_VERSION)
+    key = str(Path(xdc_file).resolve())
+    digest = file_hash(xdc_file)
+    entry = cache.get("files", {}).get(key)
+    if entry and entry.get("hash") == digest:
+        return entry["commands"], True
+
+    commands = parse_xdc(xdc_file)
+    cache["version"] = XDC_CACHE_VERSION
+    cache.setdefault("files", {})[key] = {"hash": digest, "commands": commands}
+    save_json_cache(cache_file, cache)
+    return commands, False
+
+
+def _eval_range_bound(tokens, params):
+    """Evaluate one side of a [msb:lsb] range; None if not a plain integer expression"""
+    expr = " ".join(str(params.get(t[1], t[1])) for t in tokens)
+    if not re.match(r'^[\d\s+\-*/()]+$', expr):
+        return None
+    try:
+        return int(eval(expr.replace("/", "//"), {"__builtins__": {}}))
+    except (SyntaxError, ZeroDivisionError, TypeError):
+        return None
+
+
+def _find_module(tokens, top):
+    """Return (start, end) token indices of module `top`, or None"""
+    start = next((i for i in range(len(tokens) - 1)
+                  if tokens[i][1] in ("module", "macromodule") and tokens[i + 1][1] == top), None)
+    if start is None:
+        return None
+    end = next((i for i in range(start, len(tokens)) if tokens[i][1] == "endmodule"), len(tokens))
+    return start, end
+
+
+def _scan_parameters(tokens, start, end):
+    """Return {name: (kind, value)} for the parameter/localparam declarations
+    of a module; value is None unless it is a plain integer expression"""
+    declared = {}
+    params = {}
+    i = start + 2
+    while i < end:
+        kind = tokens[i][1]
+        if kind not in ("parameter", "localparam"):
+            i += 1
+            continue
+        i += 1
+        while i < end and tokens[i][1] not in (';', ')'):
+            if tokens[i][0] == "id" and i + 1 < end and tokens[i + 1][1] == '=':
+                j = i + 2
+                while j < end and tokens[j][1] not in (',', ';', ')'):
+                    j += 1
+                val = _eval_range_bound(tokens[i + 2:j], params)
+                if val is not None:
+                    params[tokens[i][1]] = val
+                declared[tokens[i][1]] = (kind, val)
+                i = j
+                continue
+            i += 1
+    return declared
+
+
+def get_module_parameters(vfile, top):
+    """Return {name: (kind, value)} for the parameters of module `top`
+    (kind is 'parameter' or 'localparam'), or None if it isn't in vfile"""
+    with open(vfile, 'r', errors='replace') as f:
+        tokens = _tokenize(f.read())
+    span = _find_module(tokens, top)
+    return _scan_parameters(tokens, *span) if span else None
+
+
+def get_top_ports(vfile, top):
+    """Return {port: bits} for the ports of module `top`, in header order.
+    bits is None for scalar ports, a list of indices for vectors, or '?'
+    when the range depends on something we can't evaluate."""
+    with open(vfile, 'r', errors='replace') as f:
+        tokens = _tokenize(f.read())
+
+    span = _find_module(tokens, top)
+    if span is None:
+        return None
+    start, end = span
+
+    header = []
+    i = start + 2
+    if i < end and tokens[i][1] == '#':
+        i += 1
+        if i < end and tokens[i][1] == '(':
+            i, _ = _skip_parens(tokens, i)
+    if i < end and tokens[i][1] == '(':
+        close, balanced = _skip_parens(tokens, i)
+        header, _ = _parse_port_list(tokens, i + 1, close - balanced)
+
+    params = {name: val for name, (_, val) in _scan_parameters(tokens, start, end).items()
+              if val is not None}
+    ranges = {}
+    i = start + 2
+    while i < end:
+        value = tokens[i][1]
+        if value in _DIRECTIONS:
+            rng = None
+            named = False
+            i += 1
+            while i < end and tokens[i][1] not in (';', ')') and tokens[i][1] not in _DIRECTIONS:
+                kind, val, _ = tokens[i]
+                if val == '[':
+                    j = i
+                    while j < end and tokens[j][1] != ']':
+                        j += 1
+                    if not named:
+                        rng = tokens[i + 1:j]
+                    i = j + 1
+                    continue
+                if val == '=':
+                    while i < end and tokens[i][1] not in (',', ';', ')'):
+                        i += 1
+                    continue
+                if kind == "id" and val not in _VERILOG_KEYWORDS:
+                    ranges[val] = rng
+                    named = True
+                i += 1
+            continue
+        i += 1
+
+    ports = {}
+    for name in header or list(ranges):
+        rng = ranges.get(name)
+        if rng is None:
+            ports[name] = None
+            continue
+        colon = next((n for n, t in enumerate(rng) if t[1] == ':'), None)
+        if colon is None:
+            ports[name] = '?'
+            continue
+        msb = _eval_range_bound(rng[:colon], params)
+        lsb = _eval_range_bound(rng[colon + 1:], params)
+        if msb is None or lsb is None:
+            ports[name] = '?'
+        else:
+            ports[name] = list(range(min(msb, lsb), max(msb, lsb) + 1))
+    return ports
+
+
+def _port_targets(ports):
+    """Expand {port: bits} into (name, bit) pairs"""
+    for name, bits in ports.items():
+        if bits is None or bits == '?':
+            yield name, bits
+        else:
+            for bit in bits:
+                yield name, bit
+
+
+def _ref_matches(ref, name, bit):
+    ref_name, ref_bit = ref
+    if not fnmatch.fnmatchcase(name, ref_name):
+        return False
+    if bit == '?' or ref_bit in ('*', None):
+        return True
+    return ref_bit == bit
+
+
+def prune_constraints(commands, ports):
+    """Keep only the XDC commands that apply to the given top-level ports,
+    plus global (non get_ports) commands. A commented-out command is used
+    when no active command already sets that property for that port.
+    Returns (kept_commands, missing) where missing maps 'port' or
+    'port[bit]' to the pin properties nothing provides."""
+    targets = list(_port_targets(ports))
+    provided = set()
+    keep = set()
+
+    for pass_commented in (False, True):
+        for idx, cmd in enumerate(commands):
+            if cmd["commented"] != pass_commented:
+                continue
+            if not cmd["ports"]:
+                if not cmd["commented"]:
+                    keep.add(idx)
+                continue
+            hits = [(n, b) for n, b in targets if any(_ref_matches(r, n, b) for r in cmd["ports"])]
+            if not hits:
+                continue
+            new = {(n, b, p) for n, b in hits for p in cmd["props"]} - provided
+            if not cmd["commented"] or new:
+                keep.add(idx)
+                provided |= new
+
+    missing = {}
+    for name, bit in targets:
+        absent = [p for p in _PIN_PROPS if (name, bit, p) not in provided]
+        if absent:
+            label = name if bit is None or bit == '?' else f"{name}[{bit}]"
+            missing[label] = absent
+    return [commands[idx] for idx in sorted(keep)], missing
+
+
+def write_pruned_xdc(xdc_file, commands, out_file, top):
+    """Write the kept commands to a per-project XDC"""
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_file, 'w') as f:
+        f.write(f"## Generated from {Path(xdc_file).name} for top module '{top}'\n")
+        f.write("## Only constraints that match the top module's ports are kept\n\n")
+        for cmd in commands:
+            f.write(cmd["text"] + "\n")
+    return out_file
+
+
+def prepare_constraints(xdc_file, top_file, top, cache_dir):
+    """Build a pruned XDC for `top` from xdc_file.
+    Returns (xdc_path, info): xdc_path is the pruned file, or the original
+    when the top module's ports couldn't be read; info has 'kept', 'total',
+    'missing' and 'cached' (whether the parsed XDC came from cache)."""
+    commands, cached = load_xdc(xdc_file, cache_dir)
+    info = {"kept": len(commands), "total": len(commands), "missing": {}, "cached": cached}
+    ports = get_top_ports(top_file, top)
+    if not ports:
+        return Path(xdc_file), info
+    kept, missing = prune_constraints(commands, ports)
+    info.update(kept=len(kept), missing=missing)
+    out_file = Path(cache_dir) / f"{top}_constraints.xdc"
+    return write_pruned_xdc(xdc_file, kept, out_file, top), info
+
+
+# ─────────────────────────────────────────────────────────────
+# Toolchain discovery
+# ─────────────────────────────────────────────────────────────
+TOOLCHAIN_CACHE_VERSION = 2
+TOOLCHAIN_TOOLS = ("vivado", "xvlog", "xelab", "xsim", "hw_server")
+
+# Where installers put Vivado; <ver> is matched as a glob.  2025.1 and later
+# install to <root>/<ver>/Vivado instead of <root>/Vivado/<ver>.
+VIVADO_INSTALL_GLOBS = {
+    "win32": ("C:/Xilinx/Vivado/*/bin", "C:/Xilinx/*/Vivado/bin",
+              "D:/Xilinx/Vivado/*/bin", "C:/AMD/Vivado/*/bin"),
+    "posix": ("/tools/Xilinx/Vivado/*/bin", "/tools/Xilinx/*/Vivado/bin",
+              "/opt/Xilinx/Vivado/*/bin", "/opt/Xilinx/*/Vivado/bin",
+              "~/Xilinx/Vivado/*/bin", "~/tools/Xilinx/Vivado/*/bin"),
+}
+
+_VERSION_RE = re.compile(r'^(\d{4})\.(\d+)$')
+
+VIVADO_NOT_FOUND_HINT = (
+    "Pass --vivado <path>, set VIVADO_PATH to the vivado executable or its\n"
+    "install directory, or add Vivado's bin directory to your PATH")
+
+
+class Toolchain:
+    """A resolved Vivado install.
+    vivado   str           -- path to the vivado executable
+    version  str or None   -- e.g. '2018.3', taken from the install path
+    tools    {name: str or None} for xvlog, xelab, xsim and hw_server
+    source   str           -- where it was found: 'argument', 'VIVADO_PATH',
+                              'XILINX_VIVADO', 'PATH' or 'install root'
+    cached   bool          -- True when reused from the toolchain cache
+    """
+    def __init__(self, vivado, version, tools, source, cached=False):
+        self.vivado = vivado
+        self.version = version
+        self.tools = tools
+        self.source = source
+        self.cached = cached
+
+    def tool(self, name):
+        return self.vivado if name == "vivado" else self.tools.get(name)
+
+    def __repr__(self):
+        return f"<Toolchain {self.version or '?'} {self.vivado} ({self.source})>"
+
+
+def _exe_name(tool):
+    return tool + ".bat" if sys.platform == "win32" else tool
+
+
+def _install_version(vivado):
+    """Version from the install path (.../Vivado/2018.3/bin/vivado or
+    .../2025.1/Vivado/bin/vivado); None when the path does not say"""
+    for part in reversed(Path(os.path.realpath(vivado)).parts[:-1]):
+        if _VERSION_RE.match(part):
+            return part
+    return None
+
+
+def _version_key(version):
+    m = _VERSION_RE.match(version or "")
+    return (int(m.group(1)), int(m.group(2))) if m else (0, 0)
+
+
+def _version_matches(version, wanted):
+    """'2023' matches any 2023.x; '2023.2' only itself"""
+    if not wanted:
+        return True
+    return bool(version) and (version == wanted or version.startswith(wanted + "."))
+
+
+def _vivado_in(path):
+    """Accept a vivado executable, its bin directory or the install directory"""
+    path = Path(os.path.expanduser(path))
+    if path.is_file():
+        return str(path)
+    for candidate in (path / _exe_name("vivado"), path / "bin" / _exe_name("vivado")):
+        if candidate.is_file():
+            return str(candidate)
+    return None
+
+
+def _vivados_under(path):
+    """Yield the vivado at path (see _vivado_in), then, when path is a root
+    holding several versions, each version's vivado, newest first"""
+    vivado = _vivado_in(path)
+    if vivado:
+        yield vivado
+    for bin_dir in sorted(glob.glob(os.path.join(os.path.expanduser(path), "*", "bin")),
+                          key=lambda d: _version_key(Path(d).parent.name), reverse=True):
+        vivado = _vivado_in(bin_dir)
+        if vivado:
+            yield vivado
+
+
+def _vivado_candidates():
+    """Yield (vivado_path, source) in priority order.  Install roots are only
+    globbed once the cheaper sources have been tried."""
+    env_path = os.environ.get("VIVADO_PATH")
+    if env_path:
+        for vivado in _vivados_under(env_path):
+            yield vivado, "VIVADO_PATH"
+
+    xilinx_vivado = os.environ.get("XILINX_VIVADO")   # set by settings64.sh/.bat
+    if xilinx_vivado:
+        vivado = _vivado_in(xilinx_vivado)
+        if vivado:
+            yield vivado, "XILINX_VIVADO"
+
+    on_path = shutil.which("vivado")
+    if on_path:
+        yield on_path, "PATH"
+
+    found = []
+    patterns = VIVADO_INSTALL_GLOBS["win32" if sys.platform == "win32" else "posix"]
+    for pattern in patterns:
+        for bin_dir in glob.glob(os.path.expanduser(pattern)):
+            vivado = _vivado_in(bin_dir)
+            if vivado:
+                found.append(vivado)
+    # Newest first, so an unpinned lookup gets the latest install
+    for vivado in sorted(found, key=lambda v: _version_key(_install_version(v)), reverse=True):
+        yield vivado, "install root"
+
+
+def toolchain_for(vivado, source="argument"):
+    """Build a Toolchain around a known vivado executable"""
+    tools = {name: find_vivado_tool(vivado, name) for name in TOOLCHAIN_TOOLS[1:]}
+    return Toolchain(str(vivado), _install_version(vivado), tools, source)
+
+
+def _toolchain_cache_key(wanted):
+    """Anything that can change the answer is part of the key"""
+    key = [platform.node(), sys.platform, wanted or "",
+           os.environ.get("VIVADO_PATH", ""), os.environ.get("XILINX_VIVADO", ""),
+           os.environ.get("PATH", "")]
+    return hashlib.sha1("\0".join(key).encode()).hexdigest()
+
+
+def _install_root_stamps():
+    """mtime (or None) of every directory whose listing decides what the
+    install-root globs find; installing or removing a version changes one"""
+    patterns = VIVADO_INSTALL_GLOBS["win32" if sys.platform == "win32" else "posix"]
+    roots = {os.path.normpath(os.path.expanduser(p.split("*")[0])) for p in patterns}
+    if os.environ.get("VIVADO_PATH"):
+        roots.add(os.path.normpath(os.path.expanduser(os.environ["VIVADO_PATH"])))
+    stamps = {}
+    for root in sorted(roots):
+        try:
+            stamps[root] = os.path.getmtime(root)
+        except OSError:
+            stamps[root] = None
+    return stamps
+
+
+def _cached_toolchain(entry):
+    """Rebuild a Toolchain from a cache entry if every path is still there
+    and no install root has gained or lost a version since"""
+    try:
+        vivado = entry["vivado"]
+        if os.path.getmtime(vivado) != entry["mtime"]:
+            return None
+        if entry["roots"] != _install_root_stamps():
+            return None
+        for path in entry["tools"].values():
+            if path and not os.path.exists(path):
+                return None
+    except (KeyError, TypeError, OSError):
+        return None
+    return Toolchain(vivado, entry["version"], entry["tools"], entry["source"], cached=True)
+
+
+def resolve_toolchain(vivado_path=None, version=None, cache_dir=None, refresh=False):
+    """Find Vivado and its companion tools, or return None.
+    An explicit vivado_path (executable, bin or install directory, or a root
+    holding several versions) wins. Otherwise VIVADO_PATH, XILINX_VIVADO, the
+    PATH and the standard install roots are tried in that order. Either way
+    the first install whose version matches `version` (or VIVADO_VERSION)
+    is kept. Discovery results are cached per host in
+    <cache_dir>/toolchain.json and re-checked against the filesystem (tool
+    paths, vivado's mtime, install-root mtimes) before being reused;
+    refresh=True skips the cache."""
+    wanted = version or os.environ.get("VIVADO_VERSION") or None
+    if vivado_path:
+        candidates = list(_vivados_under(vivado_path))
+        if not candidates and shutil.which(str(vivado_path)):
+            candidates = [shutil.which(str(vivado_path))]
+        for vivado in candidates:
+            toolchain = toolchain_for(vivado)
+            if _version_matches(toolchain.version, wanted):
+                return toolchain
+        return None
+
+    if cache_dir is None:
+        cache_dir = Path(__file__).parent.resolve() / CACHE_DIR_NAME
+    cache_file = Path(cache_dir) / "toolchain.json"
+    key = _toolchain_cache_key(wanted)
+    cache = load_json_cache(cache_file, TOOLCHAIN_CACHE_VERSION)
+    entry = cache.get("hosts", {}).get(key)
+
+    if entry and not refresh:
+        toolchain = _cached_toolchain(entry)
+        if toolchain:
+            return toolchain
+
+    for vivado, source in _vivado_candidates():
+        toolchain = toolchain_for(vivado, source)
+        if _version_matches(toolchain.version, wanted):
+            break
+    else:
+        return None
+
+    cache["version"] = TOOLCHAIN_CACHE_VERSION
+    cache.setdefault("hosts", {})[key] = {
+        "vivado": toolchain.vivado, "version": toolchain.version,
+        "tools": toolchain.tools, "source": toolchain.source,
+        "mtime": os.path.getmtime(toolchain.vivado), "roots": _install_root_stamps()}
+    save_json_cache(cache_file, cache)
+    return toolchain
+
+
+# ─────────────────────────────────────────────────────────────
+# Vivado helpers
+# ─────────────────────────────────────────────────────────────
+def extract_errors(output):
+    """Return the ERROR lines of a Vivado transcript, in order"""
+    return [l.strip() for l in output.splitlines() if "ERROR" in l]